@@ -0,0 +1,82 @@
+"""
+Benchmark the vectorized clean_match_feed against the previous row-wise version.
+
+Usage:
+    python scripts/bench_clean_match_feed.py
+    python scripts/bench_clean_match_feed.py --feed data/raw/matches/match_feed --repeat 20
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from mls.cleaning.matches.clean_match_feed import clean_match_feed
+
+
+def clean_match_feed_rowwise(df):
+    # the pre-vectorization implementation, kept here as the reference for output and timing
+    df = df.copy()
+
+    df['title'] = df.apply(lambda x: 'Corner' if pd.notna(x['comment']) and 'corner' in x['comment'].lower() else x['title'], axis=1)
+    df['title'] = df.apply(lambda x: 'Foul' if pd.notna(x['comment']) and 'foul' in x['comment'].lower() else x['title'], axis=1)
+    df['title'] = df.apply(lambda x: 'Offside' if pd.notna(x['comment']) and 'offside' in x['comment'].lower() else x['title'], axis=1)
+
+    df = df[~df['comment'].str.contains('Lineups', na=False)]
+    df = df[~df['title'].str.contains('KICK OFF|HALF TIME|FULL TIME|END OF SECOND HALF', na=False)]
+    df = df[df['minute'].notna()]
+    df = df.iloc[::-1].reset_index(drop=True)
+
+    df['title'] = df['title'].fillna('Substitution')
+    df['comment'] = df.apply(lambda x: f"Substitution: {x['out_player']} out, {x['in_player']} in" if x['title'] == 'Substitution' else x['comment'], axis=1)
+
+    df['feed_id'] = df.groupby('match_id').cumcount() + 1
+    df = df.sort_values(by=['date', 'match_id', 'feed_id'], ascending=[False, True, False]).reset_index(drop=False)
+    df = df.drop(columns=['in_player', 'out_player'])
+    df = df[['match_id', 'date', 'feed_id', 'minute', 'title', 'comment']]
+    df.rename(columns={'minute': 'event_minute', 'title': 'event_type', 'comment': 'event_comment', 'feed_id': 'event_id'}, inplace=True)
+    return df[['event_id', 'match_id', 'event_minute', 'event_type', 'event_comment']]
+
+
+def load_feed(path: Path) -> pd.DataFrame:
+    files = sorted(path.glob("*.csv")) if path.is_dir() else [path]
+    return pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+
+
+def best_of(fn, df, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = fn(df)
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_match_feed benchmark")
+    parser.add_argument("--feed",   type=Path, default=Path("data/raw/matches/match_feed"),
+                        help="Raw feed CSV or a directory of them")
+    parser.add_argument("--repeat", type=int, default=10, help="Tile the feed N times (one season ≈ 10x the sample)")
+    parser.add_argument("--runs",   type=int, default=3,  help="Timed runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    feed = load_feed(args.feed)
+    # give every tile its own match_ids so per-match numbering behaves like a real season
+    feed = pd.concat(
+        [feed.assign(match_id=feed["match_id"].astype(str) + f"_{i}") for i in range(args.repeat)],
+        ignore_index=True,
+    )
+    print(f"{len(feed):,} feed rows, {feed['match_id'].nunique():,} matches")
+
+    t_old, old = best_of(clean_match_feed_rowwise, feed, args.runs)
+    t_new, new = best_of(clean_match_feed, feed, args.runs)
+
+    pd.testing.assert_frame_equal(old, new)
+    print("outputs identical")
+    print(f"row-wise:   {t_old * 1000:8.1f} ms")
+    print(f"vectorized: {t_new * 1000:8.1f} ms")
+    print(f"speedup:    {t_old / t_new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Check that a failing last flush does not abort a scrape loop or lose its rows.
+
+Pre-fills a FrameSink whose on_flush always raises, runs scrape_match_list with
+no links (so the only flush is the final one) and checks that the buffered rows
+and URLs end up in a recovery backup instead of a FlushError escaping.
+
+Usage:
+    python scripts/check_flush_recovery.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# the historical pipeline is run as a script from its own directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "mls" / "historical"))
+import mls_pipeline as pipeline
+
+
+def failing_flush(chunk):
+    raise OSError("disk full")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)   # RAW_BASE, and with it the recovery directory, is relative to the working directory
+
+        sink = pipeline.FrameSink(pipeline.PATHS.keys(), on_flush=failing_flush, flush_every=100)
+        links = ["https://www.mlssoccer.com/competitions/mls-regular-season/2025/matches/a",
+                 "https://www.mlssoccer.com/competitions/mls-regular-season/2025/matches/b"]
+        for i, link in enumerate(links):
+            sink.add({"match_data": pd.DataFrame([{"match_id": f"m{i}", "date": "2025-03-01"}])}, tag=link)
+
+        result = pipeline.scrape_match_list(None, [], sink=sink)
+
+        dumps = list(pipeline.RECOVERY_DIR.iterdir())
+        assert len(dumps) == 1, dumps
+        saved = pd.read_csv(dumps[0] / "match_data.csv")
+        assert saved["match_id"].tolist() == ["m0", "m1"], saved
+        assert pd.read_csv(dumps[0] / "links.csv")["url"].tolist() == links
+        assert all(df.empty for df in result.values())
+        assert sink.drain()[1] == []
+
+    print("OK: final flush failure was logged and its rows written to the recovery backup")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
+import numpy as np
 import pandas as pd
 import re
 
 def clean_match_feed(df):
     df = df.copy()
-    
-    df['title'] = df.apply(lambda x: 'Corner' if pd.notna(x['comment']) and 'corner' in x['comment'].lower() else x['title'], axis=1)
-
-    df['title'] = df.apply(lambda x: 'Foul' if pd.notna(x['comment']) and 'foul' in x['comment'].lower() else x['title'], axis=1)
 
-    df['title'] = df.apply(lambda x: 'Offside' if pd.notna(x['comment']) and 'offside' in x['comment'].lower() else x['title'], axis=1)   
+    # title overrides from the comment text; later rules win, so they come first in np.select
+    comment = df['comment'].str.lower()
+    df['title'] = np.select(
+        [
+            comment.str.contains('offside', regex=False, na=False),
+            comment.str.contains('foul', regex=False, na=False),
+            comment.str.contains('corner', regex=False, na=False),
+        ],
+        ['Offside', 'Foul', 'Corner'],
+        default=df['title'].to_numpy(dtype=object),
+    )
     
     df = df[~df['comment'].str.contains('Lineups', na=False)]
 
@@ -20,7 +27,8 @@ def clean_match_feed(df):
     
     df['title'] = df['title'].fillna('Substitution')
 
-    df['comment'] = df.apply(lambda x: f"Substitution: {x['out_player']} out, {x['in_player']} in" if x['title'] == 'Substitution' else x['comment'], axis=1)
+    sub_comment = "Substitution: " + df['out_player'].astype(str) + " out, " + df['in_player'].astype(str) + " in"
+    df['comment'] = df['comment'].where(df['title'] != 'Substitution', sub_comment)
     
     df['feed_id'] = df.groupby('match_id').cumcount() + 1
         
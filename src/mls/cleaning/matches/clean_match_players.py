@@ -1,6 +1,8 @@
 import pandas as pd
 import re
 
+from mls.utils.names import norm_team, normalize_series
+
 team_map = {
     "Atlanta United": "ATL",
     "Austin FC": "ATX",
@@ -47,17 +49,6 @@ def clean_match_players(df: pd.DataFrame) -> pd.DataFrame:
 
 
     # ---- team mapping ----
-    def norm_team(s):
-        if pd.isna(s):
-            return ""
-        return (
-            str(s)
-            .lower()
-            .strip()
-            .replace(".", "")
-            .replace("’", "'")
-        )
-
     # Use your team_map as the base truth
     team_map_norm = {norm_team(k): v for k, v in team_map.items()}
 
@@ -86,10 +77,10 @@ def clean_match_players(df: pd.DataFrame) -> pd.DataFrame:
     abbrs = set(team_map_norm.values())
 
     if "club" in df.columns:
-        df["_club_norm"] = df["club"].apply(norm_team)
+        df["_club_norm"] = normalize_series(df["club"], norm_team)
 
-        df["club"] = df["_club_norm"].apply(
-            lambda x: x.upper() if x.upper() in abbrs else team_map_norm.get(x)
+        df["club"] = normalize_series(
+            df["_club_norm"], lambda x: x.upper() if x.upper() in abbrs else team_map_norm.get(x)
         )
 
         # Drop helper norm column
@@ -188,11 +179,6 @@ def clean_match_gk(df: pd.DataFrame) -> pd.DataFrame:
     df = df[["match_id"] + [c for c in df.columns if c != "match_id"]]
  
     # ---- team mapping ----
-    def norm_team(s):
-        if pd.isna(s):
-            return ""
-        return str(s).lower().strip().replace(".", "").replace("\u2019", "'")
- 
     team_map_norm = {norm_team(k): v for k, v in team_map.items()}
     aliases = {
         "chicago fire": "CHI",
@@ -216,9 +202,9 @@ def clean_match_gk(df: pd.DataFrame) -> pd.DataFrame:
     abbrs = set(team_map_norm.values())
  
     if "club" in df.columns:
-        df["_club_norm"] = df["club"].apply(norm_team)
-        df["club"] = df["_club_norm"].apply(
-            lambda x: x.upper() if x.upper() in abbrs else team_map_norm.get(x)
+        df["_club_norm"] = normalize_series(df["club"], norm_team)
+        df["club"] = normalize_series(
+            df["_club_norm"], lambda x: x.upper() if x.upper() in abbrs else team_map_norm.get(x)
         )
         df = df.drop(columns=["_club_norm"])
     else:
@@ -1,31 +1,23 @@
 import pandas as pd
 import re
 
+from mls.cleaning.reframe_stats import map_unique, pivot_home_away
 
-def reframe_stats(df):
-    match_id = df['match_id'].iloc[0]
-    out = {}
-
-    for _, row in df.iterrows():
-        stat = row.get("stat")
-        if pd.isna(stat):
-            continue
-        stat = str(stat).strip().lower()
-        if stat in ("", "nan", "none") or "nan" in stat:
-            continue
 
-        out[f"{stat}_home"] = row.get("home_value")
-        out[f"{stat}_away"] = row.get("away_value")
+def reframe_stats(df):
+    """One wide row per match_id for a whole batch of long-format team stats."""
+    stat = df["stat"]
+    key = stat.astype(str).str.strip().str.lower()
+    keep = stat.notna() & ~key.isin(["", "none"]) & ~key.str.contains("nan", regex=False)
 
-    wide = pd.DataFrame([out]) if out else pd.DataFrame([{}])
+    long = df.loc[keep, ["match_id", "home_value", "away_value"]]
+    # column-name normalisation runs once per distinct stat, not per column per match
+    long["stat"] = map_unique(key[keep], lambda st: re.sub(r"\s+", "_", st.replace('%', 'pct').replace('-', '_')))
 
-    wide.columns = [
-        re.sub(r"\s+", "_",
-        c.replace('%', 'pct').replace('-', '_')).lower()
-        for c in wide.columns
-    ]
-    wide["match_id"] = match_id
-    return wide
+    wide = pivot_home_away(long)
+    # matches whose rows were all junk still get a (match_id-only) row
+    wide = wide.set_index("match_id").reindex(pd.unique(df["match_id"])).reset_index()
+    return wide[[c for c in wide.columns if c != "match_id"] + ["match_id"]]
 
 
 
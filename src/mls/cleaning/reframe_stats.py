@@ -1,5 +1,38 @@
 import pandas as pd
 import re
+
+
+def map_unique(s: pd.Series, fn) -> pd.Series:
+    """Apply a scalar string function once per distinct value instead of once per row."""
+    uniques = pd.unique(s)
+    return s.map(dict(zip(uniques, (fn(u) for u in uniques))))
+
+
+def pivot_home_away(df: pd.DataFrame, key: str = "match_id") -> pd.DataFrame:
+    """
+    Long (key, stat, home_value, away_value) rows -> one row per key with
+    '{stat}_home' / '{stat}_away' columns, in a single pivot over the whole batch.
+
+    Stats keep their first-seen column order, a repeated stat within a key keeps
+    its last value (as the old dict-building loop did), and keys keep their
+    first-seen row order. Keys without any stat rows still get a row.
+    """
+    keys = pd.unique(df[key])
+    order = pd.unique(df["stat"])
+    if len(order) == 0:
+        return pd.DataFrame({key: keys})
+    long = df.drop_duplicates([key, "stat"], keep="last")
+
+    wide = long.pivot(index=key, columns="stat", values=["home_value", "away_value"])
+    wide = wide.reindex(
+        index=keys,
+        columns=pd.MultiIndex.from_tuples([(side, st) for st in order for side in ("home_value", "away_value")]),
+    )
+    wide.columns = [f"{st}_{side[:-len('_value')]}" for side, st in wide.columns]
+    wide.index.name = key
+    return wide.reset_index().infer_objects()
+
+
 def reframe_stats(df, fname: str | None = None):
     """
     Transform a long-format statistics DataFrame into a wide-format DataFrame with separate home/away columns.
@@ -15,10 +48,12 @@ def reframe_stats(df, fname: str | None = None):
     fname : str or None, optional
         Filename containing match information in the format: '{home}_vs_{away}_{MM-DD-YYYY}'.
         If None, attempts to use df.attrs['source_filename']. Default is None.
+        With several match_ids in df, the filename metadata is applied to each of them.
     Returns
     -------
     pd.DataFrame
-        A wide-format DataFrame where each statistic from the input becomes two columns:
+        A wide-format DataFrame with one row per match_id (a single row if there is no
+        match_id column) where each statistic from the input becomes two columns:
         '{stat}_home' and '{stat}_away'. Additional columns include:
         - 'match_id': Match identifier (if present in input)
         - 'teams_home', 'teams_away': Team codes extracted from filename
@@ -41,38 +76,37 @@ def reframe_stats(df, fname: str | None = None):
     df = df.copy()
     m = re.search(r'([a-z]{3})[ _-]*v?s[ _-]*([a-z]{3}).*?(\d{2}-\d{2}-\d{4})', fname, re.I)
 
+    need = {'stat', 'home_value', 'away_value'}
+    missing = need - set(df.columns)
+    if missing:
+        raise KeyError(f"reframe_stats expected {need}; missing {missing}. Got: {list(df.columns)[:10]}")
+
+    has_id = 'match_id' in df.columns
+    if not has_id:
+        df['match_id'] = 0
+
     parts = []
     if m:
         home, away, date_str = m.groups()
         home, away = home.upper(), away.upper()
         date = pd.to_datetime(date_str, format="%m-%d-%Y")
-        parts.append(pd.DataFrame({'home_value': [home], 'away_value': [away], 'stat': ['teams']}))
-        parts.append(pd.DataFrame({'home_value': [date], 'away_value': [date], 'stat': ['date']}))
+        ids = pd.unique(df['match_id'])
+        parts.append(pd.DataFrame({'match_id': ids, 'home_value': home, 'away_value': away, 'stat': 'teams'}))
+        parts.append(pd.DataFrame({'match_id': ids, 'home_value': date, 'away_value': date, 'stat': 'date'}))
 
     if parts:
         df = pd.concat([df, *parts], ignore_index=True)
 
-    need = {'stat', 'home_value', 'away_value'}
-    missing = need - set(df.columns)
-    if missing:
-        raise KeyError(f"reframe_stats expected {need}; missing {missing}. Got: {list(df.columns)[:10]}")
+    # normalise each distinct stat name once, before the pivot
+    df['stat'] = map_unique(df['stat'].astype(str), lambda st: (
+        'match_date' if st == 'date' else
+        st.replace(' ', '_').replace('%', 'pct').replace('-', '_').lower()
+    ))
+
+    wide = pivot_home_away(df[['match_id', 'stat', 'home_value', 'away_value']])
+    wide = wide.drop(columns=['match_date_away'], errors='ignore')
+    wide = wide.rename(columns={'match_date_home': 'match_date'})
 
-    out = {}
-    for _, row in df.iterrows():
-        out[f"{row['stat']}_home"] = row['home_value']
-        out[f"{row['stat']}_away"] = row['away_value']
-
-    wide = pd.DataFrame([out])
-    if 'date_away' in wide.columns:
-        wide = wide.drop(columns=['date_away'])
-    wide = wide.rename(columns={'date_home': 'match_date'})
-    wide.columns = (pd.Index(wide.columns)
-                    .str.replace(' ', '_')
-                    .str.replace('%', 'pct')
-                    .str.replace('-', '_')
-                    .str.lower())
-    
-    if 'match_id' in df.columns:                
-        wide.insert(0, 'match_id', df['match_id'].iloc[0])  
-        
+    if not has_id:
+        wide = wide.drop(columns=['match_id'])
     return wide
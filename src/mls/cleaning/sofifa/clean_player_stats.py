@@ -1,19 +1,8 @@
+import numpy as np
 import pandas as pd
 import re
-import unicodedata
 
-# -------------------------
-# name normalization
-# -------------------------
-def norm_name(x):
-    if pd.isna(x):
-        return None
-    x = unicodedata.normalize("NFKD", str(x))
-    x = "".join(c for c in x if not unicodedata.combining(c))
-    x = x.lower().strip()
-    x = re.sub(r"[^\w\s]", "", x)
-    x = re.sub(r"\s+", " ", x)
-    return x or None
+from mls.utils.names import norm_name_compact, normalize_series, strip_accents
 
 # -------------------------
 # team mapping
@@ -69,6 +58,22 @@ def clean_team_name(s):
 
 team_map_clean = {clean_team_name(k): v for k, v in team_map.items()}
 
+# -------------------------
+# per-unique-value helpers: snapshots repeat the same names/teams across dates,
+# so the Python-level work only runs once per distinct string
+# -------------------------
+def apply_unique(s, fn):
+    # run a Series -> Series/DataFrame parser over the distinct values only, then broadcast back
+    codes, uniq = pd.factorize(s, use_na_sentinel=False)
+    out = fn(pd.Series(uniq, dtype=object)).iloc[codes]
+    out.index = s.index
+    return out
+
+def clean_display_name(x):
+    # accent strip + nbsp/zero-width cleanup for the displayed name
+    x = strip_accents(x).replace("\xa0", " ").replace("\u200b", "")
+    return re.sub(r"\s+", " ", x).strip()
+
 # -------------------------
 # remove glued position suffixes from Sofifa "Name"
 # -------------------------
@@ -76,14 +81,14 @@ POS_CODES = ["GK","RWB","LWB","RB","LB","CB","CDM","CM","CAM","RM","LM","RW","LW
 POS_CODES = sorted(POS_CODES, key=len, reverse=True)
 pos_pat = re.compile(rf"^(?P<name>.*?)(?P<pos>(?:{'|'.join(POS_CODES)})+)$")
 
-def split_name_pos(s):
-    if pd.isna(s):
-        return pd.Series([None, None])
-    s = str(s).strip()
-    m = pos_pat.match(s)
-    if m:
-        return pd.Series([m.group("name").strip(), m.group("pos").strip()])
-    return pd.Series([s, None])
+def split_name_pos(names):
+    """(name, pos) columns for a Series of raw names; unmatched names keep pos None."""
+    s = names.where(names.isna(), names.astype(str).str.strip())
+    m = s.str.extract(pos_pat)
+    out = pd.DataFrame(index=names.index)
+    out["name"] = m["name"].str.strip().fillna(s)
+    out["pos"] = m["pos"].str.strip()
+    return out.astype(object).where(out.notna(), None)
 
 # -------------------------
 # parse "Team & Contract" field: "GK(14)2018 ~ 2020"
@@ -91,63 +96,60 @@ def split_name_pos(s):
 team_contract_pat = re.compile(r'(?P<pos>\w+)\((?P<num>\d+)\)(?P<start>\d{4})\s*~\s*(?P<end>\d{4})')
 
 def parse_team_contract(s):
-    if pd.isna(s):
-        return pd.Series([pd.NA, pd.NA, pd.NA, pd.NA])
-    s = str(s)
-    m = team_contract_pat.search(s)
-    if not m:
-        return pd.Series([pd.NA, pd.NA, pd.NA, pd.NA])
-    return pd.Series([m.group("pos"), m.group("num"), m.group("start"), m.group("end")])
+    """pos/num/start/end columns for a Series of "Team & Contract" strings (NA where it doesn't parse)."""
+    m = s.astype(str).where(s.notna()).str.extract(team_contract_pat)
+    return m.astype(object).where(m.notna(), pd.NA)
 
 # -------------------------
 # money parsing ("€150K", "€1.2M") robust
 # -------------------------
 def parse_money_eur(x):
-    if pd.isna(x):
-        return pd.NA
-    s = str(x)
-    s = s.replace("â‚¬", "€")
-    s = s.replace("€", "").replace(",", "").strip()
-    mult = 1
-    if s.endswith(("K", "k")):
-        mult = 1_000
-        s = s[:-1]
-    elif s.endswith(("M", "m")):
-        mult = 1_000_000
-        s = s[:-1]
-    try:
-        return int(float(s) * mult)
-    except:
-        return pd.NA
+    s = (
+        x.astype(str).where(x.notna())
+        .str.replace("â‚¬", "€", regex=False)
+        .str.replace("€", "", regex=False)
+        .str.replace(",", "", regex=False)
+        .str.strip()
+    )
+    suffix = s.str[-1:].str.upper()
+    mult = suffix.map({"K": 1_000, "M": 1_000_000}).fillna(1)
+    num = pd.to_numeric(s.where(mult == 1, s.str[:-1]), errors="coerce")
+    # truncate like int(float(s) * mult); anything unparseable ends up NaN
+    return pd.Series(np.trunc(num * mult), index=x.index)
 
 def parse_height_cm(x):
-    if pd.isna(x): 
-        return pd.NA
-    s = str(x)
-    m = re.search(r"(\d+)\s*cm", s, flags=re.I)
-    return int(m.group(1)) if m else pd.NA
+    return pd.to_numeric(x.astype(str).where(x.notna()).str.extract(r"(\d+)\s*cm", flags=re.I)[0])
 
 def parse_weight_kg(x):
-    if pd.isna(x): 
-        return pd.NA
-    s = str(x)
-    m = re.search(r"(\d+)\s*kg", s, flags=re.I)
-    return int(m.group(1)) if m else pd.NA
+    return pd.to_numeric(x.astype(str).where(x.notna()).str.extract(r"(\d+)\s*kg", flags=re.I)[0])
 
 # -------------------------
 # safe eval for "85+2" etc (your original behavior)
 # -------------------------
-def safe_eval(x):
-    try:
-        s = str(x)
-        if '+' in s:
-            return sum(int(i) for i in s.split('+'))
-        if '-' in s:
-            parts = [int(i) for i in s.split('-')]
-            return parts[0] - sum(parts[1:])
-        return int(s)
-    except:
-        return x
+int_pat = re.compile(r"^\s*\d+\s*$")
+plus_pat = re.compile(r"^\s*\d+\s*(?:\+\s*\d+\s*)+$")
+minus_pat = re.compile(r"^\s*\d+\s*(?:-\s*\d+\s*)+$")
+
+def safe_eval(col):
+    """
+    Evaluate sofifa math strings in an object column: "85" -> 85, "85+2" -> 87,
+    "85-2" -> 83. Anything else (text, "+3", "85+2-1", NaN) is returned unchanged.
+    """
+    s = col.astype(str)
+    is_int = s.str.match(int_pat)
+    is_plus = s.str.match(plus_pat)
+    is_minus = s.str.match(minus_pat)
+
+    out = col.copy()
+    if is_int.any():
+        out[is_int] = s[is_int].astype("int64").astype(object)
+    if is_plus.any() or is_minus.any():
+        terms = s[is_plus | is_minus].str.extractall(r"(\d+)")[0].astype("int64").groupby(level=0)
+        total, first = terms.sum(), terms.first()
+        # a - b - c == 2a - (a + b + c)
+        out[is_plus] = total[is_plus[is_plus].index].astype(object)
+        out[is_minus] = (2 * first - total)[is_minus[is_minus].index].astype(object)
+    return out
 
 # -------------------------
 # FINAL schema (exact)
@@ -208,12 +210,9 @@ def clean_player_stats(df):
         raise ValueError("Need a name column (name or player_name).")
 
     # ---- name cleanup (glued suffix + accent strip) ----
-    df[["name_clean", "_pos_suffix"]] = df["name"].apply(split_name_pos)
-    df["name"] = df["name_clean"].astype(str).apply(lambda x: unicodedata.normalize("NFKD", x))
-    df["name"] = df["name"].apply(lambda x: "".join(c for c in x if not unicodedata.combining(c)))
-    df["name"] = df["name"].str.replace("\xa0", " ", regex=False).str.replace("\u200b", "", regex=False)
-    df["name"] = df["name"].str.replace(r"\s+", " ", regex=True).str.strip()
-    df["_name_norm"] = df["name"].map(norm_name)
+    df[["name_clean", "_pos_suffix"]] = apply_unique(df["name"], split_name_pos)
+    df["name"] = normalize_series(df["name_clean"].astype(str), clean_display_name)
+    df["_name_norm"] = normalize_series(df["name"], norm_name_compact)
 
     # ---- team_name: backfill from common sources if empty/missing ----
     if "team_name" not in df.columns or df["team_name"].isna().all():
@@ -231,11 +230,11 @@ def clean_player_stats(df):
         .str.strip()
         .replace({"nan": pd.NA, "None": pd.NA})
     )
-    df["_team_abbr"] = df["team_name"].map(clean_team_name).map(team_map_clean)
+    df["_team_abbr"] = normalize_series(df["team_name"], clean_team_name).map(team_map_clean)
 
     # ---- contract parsing from combined field ----
     if "team_&_contract" in df.columns and df["team_&_contract"].notna().any():
-        df[["position", "jersey_num", "contract_start", "contract_end"]] = df["team_&_contract"].apply(parse_team_contract)
+        df[["position", "jersey_num", "contract_start", "contract_end"]] = apply_unique(df["team_&_contract"], parse_team_contract).to_numpy()
     else:
         for c in ["position", "jersey_num", "contract_start", "contract_end"]:
             if c not in df.columns:
@@ -243,15 +242,15 @@ def clean_player_stats(df):
 
     # ---- height/weight ----
     if "height_cm" not in df.columns:
-        df["height_cm"] = df["height"].map(parse_height_cm) if "height" in df.columns else pd.NA
+        df["height_cm"] = apply_unique(df["height"], parse_height_cm) if "height" in df.columns else pd.NA
     if "weight_kg" not in df.columns:
-        df["weight_kg"] = df["weight"].map(parse_weight_kg) if "weight" in df.columns else pd.NA
+        df["weight_kg"] = apply_unique(df["weight"], parse_weight_kg) if "weight" in df.columns else pd.NA
 
     # ---- money ----
     if "wage_eur" not in df.columns:
-        df["wage_eur"] = df["wage"].map(parse_money_eur) if "wage" in df.columns else pd.NA
+        df["wage_eur"] = apply_unique(df["wage"], parse_money_eur) if "wage" in df.columns else pd.NA
     if "value_eur" not in df.columns:
-        df["value_eur"] = df["value"].map(parse_money_eur) if "value" in df.columns else pd.NA
+        df["value_eur"] = apply_unique(df["value"], parse_money_eur) if "value" in df.columns else pd.NA
 
     # ---- date ----
     if "date" in df.columns:
@@ -262,11 +261,12 @@ def clean_player_stats(df):
     # ---- safe_eval on “stat” columns (skip obvious text/date columns) ----
     skip_eval = {"date", "name", "team_name", "foot", "best_position", "position"}
     for col in df.columns:
-        if col in skip_eval:
+        # columns outside the final schema are dropped below, so don't spend time on them
+        if col in skip_eval or col not in FINAL_COLS:
             continue
         # only apply where it looks like sofifa math strings
         if df[col].dtype == object:
-            df[col] = df[col].apply(safe_eval)
+            df[col] = apply_unique(df[col], safe_eval)
 
     # ---- ensure FINAL_COLS exist ----
     for c in FINAL_COLS:
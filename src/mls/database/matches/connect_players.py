@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import re
-import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Dict
 
+import numpy as np
 import pandas as pd
 from rapidfuzz import process, fuzz
 from sqlalchemy import text
 
+from mls.utils.names import norm_name, norm_abbr, normalize_series
+
 
 # -------------------------
 # config
@@ -28,29 +29,6 @@ class AttachConfig:
     log_path: str = "data/interim/unmatched_match_players.csv"
 
 
-# -------------------------
-# normalization
-# -------------------------
-def _strip_accents(s: str) -> str:
-    s = unicodedata.normalize("NFKD", s)
-    return "".join(c for c in s if not unicodedata.combining(c))
-
-def norm_name(s) -> str:
-    if pd.isna(s):
-        return ""
-    s = str(s).replace("\u200b", "").replace("\xa0", " ").strip()
-    s = _strip_accents(s).lower()
-    s = s.replace(".", " ")
-    s = re.sub(r"[^\w\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def norm_abbr(s) -> str:
-    if pd.isna(s):
-        return ""
-    return str(s).strip().upper()
-
-
 # -------------------------
 # DB fetches (ONLY: teams, team_roster, players_general)
 # -------------------------
@@ -86,10 +64,93 @@ def fetch_players_general(engine) -> pd.DataFrame:
         WHERE player_id IS NOT NULL AND name IS NOT NULL
     """)
     df = pd.read_sql(q, engine)
-    df["_name_norm"] = df["name"].map(norm_name)
+    df["_name_norm"] = normalize_series(df["name"], norm_name)
     return df[["player_id", "name", "_name_norm"]]
 
 
+# -------------------------
+# candidate index
+# -------------------------
+class CandidateIndex:
+    """
+    Roster candidates per (team_id, match date).
+
+    Each team's dated stints are kept sorted by stint_start, so the stints that
+    have started by a date are a searchsorted prefix that only needs an
+    end-date check. Candidate names come from the team's slice of
+    players_general, in players_general order, so exact/fuzzy tie-breaking is
+    the same as filtering the full frame. Resolutions are memoized per
+    (team_id, date).
+    """
+
+    def __init__(self, roster: pd.DataFrame, players: pd.DataFrame):
+        pids = players["player_id"].to_numpy(dtype=object)
+        pnames = players["_name_norm"].to_numpy(dtype=object)
+
+        self.teams: Dict[int, tuple] = {}
+        for tid, g in roster.groupby("team_id"):
+            ever = g["player_id"].astype(str).unique()
+            dated = g[g["stint_start"].notna()].sort_values("stint_start", kind="stable")
+            in_team = np.isin(pids, ever)
+
+            # stints point at integer codes of the team's player ids (-1: no players_general row)
+            codes, uniq = pd.factorize(pids[in_team])
+            stint_codes = pd.Index(uniq).get_indexer(dated["player_id"].astype(str))
+            self.teams[int(tid)] = (
+                ever,
+                dated["stint_start"].to_numpy(),
+                dated["stint_end"].to_numpy(),
+                stint_codes,
+                codes,
+                pids[in_team],
+                pnames[in_team],
+            )
+        self._memo: Dict[tuple, object] = {}
+
+    def team_names(self, team_id: int) -> np.ndarray:
+        """Every players_general name tied to the team; candidate masks index into this array."""
+        return self.teams[team_id][6]
+
+    def candidates(self, team_id: int, mdate=None):
+        """
+        (names, ids, {name: first position}, mask over team_names) for the team
+        on mdate, or a no-candidate reason string.
+        """
+        key = (team_id, mdate)
+        if key not in self._memo:
+            self._memo[key] = self._resolve(team_id, mdate)
+        return self._memo[key]
+
+    def _resolve(self, team_id: int, mdate):
+        t = self.teams.get(team_id)
+        if t is None:
+            return "no_roster_for_team"
+        ever, start, end, stint_codes, codes, pids, pnames = t
+
+        if mdate is None:
+            if len(ever) == 0:
+                return "no_roster_candidates"
+            keep = np.ones(len(codes), dtype=bool)
+        else:
+            d = np.datetime64(mdate)
+            n = np.searchsorted(start, d, side="right")
+            cand = stint_codes[:n][end[:n] >= d]
+            if len(cand) == 0:
+                return "no_roster_candidates"
+            present = np.zeros(len(codes) + 1, dtype=bool)
+            present[cand] = True            # -1 lands in the spare last slot
+            keep = present[codes]
+        if not keep.any():
+            return "no_names_for_candidate_ids"
+
+        names = pnames[keep].tolist()
+        ids = pids[keep].tolist()
+        exact: Dict[str, int] = {}
+        for j, n in enumerate(names):
+            exact.setdefault(n, j)
+        return names, ids, exact, keep
+
+
 # -------------------------
 # main
 # -------------------------
@@ -103,8 +164,8 @@ def attach_player_ids(match_df: pd.DataFrame, engine, cfg: Optional[AttachConfig
             raise ValueError(f"attach_player_ids: match_df missing required column '{c}'")
 
     # Normalize match inputs
-    df["_club"] = df[cfg.club_col].map(norm_abbr)
-    df["_pname"] = df[cfg.name_col].map(norm_name)
+    df["_club"] = normalize_series(df[cfg.club_col], norm_abbr)
+    df["_pname"] = normalize_series(df[cfg.name_col], norm_name)
 
     # Optional date
     use_date = bool(cfg.date_col) and cfg.date_col in df.columns
@@ -121,59 +182,61 @@ def attach_player_ids(match_df: pd.DataFrame, engine, cfg: Optional[AttachConfig
     # Map club -> team_id
     df = df.merge(teams, left_on="_club", right_on="team_abbr", how="left").drop(columns=["team_abbr"], errors="ignore")
 
-    # Pre-group roster and players for speed
-    roster_by_team: Dict[int, pd.DataFrame] = {int(tid): g for tid, g in roster.groupby("team_id")}
-    players_by_id = players.set_index("player_id")
-
-    def match_row(r):
-        pname = r["_pname"]
-        team_id = r.get("team_id", None)
+    # Candidate lookups are shared by every player of a team in the same match
+    index = CandidateIndex(roster, players)
 
+    # exact pass; names that miss are queued per candidate set for batched fuzzy scoring
+    pnames = df["_pname"].tolist()
+    out = []
+    pending: Dict[tuple, list] = {}
+    for i, (pname, team_id, mdate) in enumerate(zip(pnames, df["team_id"], df["_mdate"])):
         if not pname:
-            return pd.NA, "blank_name", None
+            out.append((pd.NA, "blank_name", None))
+            continue
         if pd.isna(team_id):
-            return pd.NA, "no_team_id_from_teams", None
-
-        team_id = int(team_id)
-        g = roster_by_team.get(team_id)
-        if g is None or g.empty:
-            return pd.NA, "no_roster_for_team", None
-
-        # Candidate roster rows
-        if use_date and pd.notna(r["_mdate"]):
-            mdate = r["_mdate"]
-            cand_roster = g[(g["stint_start"].notna()) & (g["stint_start"] <= mdate) & (mdate <= g["stint_end"])]
+            out.append((pd.NA, "no_team_id_from_teams", None))
+            continue
+
+        # no date: anyone who ever appeared for the team
+        key = (int(team_id), mdate if use_date and pd.notna(mdate) else None)
+        cands = index.candidates(*key)
+        if isinstance(cands, str):
+            out.append((pd.NA, cands, None))
+            continue
+
+        j = cands[2].get(pname)
+        if j is not None:
+            out.append((cands[1][j], "exact", 100))
         else:
-            cand_roster = g  # no date: anyone who ever appeared for the team
-
-        if cand_roster.empty:
-            return pd.NA, "no_roster_candidates", None
-
-        cand_ids = cand_roster["player_id"].astype(str).unique().tolist()
-
-        # Bring candidate names from players_general
-        cand_players = players[players["player_id"].isin(cand_ids)]
-        if cand_players.empty:
-            return pd.NA, "no_names_for_candidate_ids", None
-
-        names = cand_players["_name_norm"].tolist()
-        ids = cand_players["player_id"].tolist()
-
-        # exact
-        try:
-            j = names.index(pname)
-            return ids[j], "exact", 100
-        except ValueError:
-            pass
-
-        # fuzzy
-        best = process.extractOne(pname, names, scorer=fuzz.token_sort_ratio)
-        if best and best[1] >= cfg.threshold:
-            return ids[best[2]], "fuzzy", int(best[1])
-
-        return pd.NA, "no_match", int(best[1]) if best else None
-
-    res = df.apply(match_row, axis=1, result_type="expand")
+            out.append(None)
+            pending.setdefault(key, []).append(i)
+
+    # fuzzy: one cdist per team over every queued name and the team's full name list,
+    # then each (team, date) group takes its best among its own candidate columns
+    by_team: Dict[int, list] = {}
+    for key in pending:
+        by_team.setdefault(key[0], []).append(key)
+
+    for team_id, keys in by_team.items():
+        queries = list(dict.fromkeys(pnames[i] for key in keys for i in pending[key]))
+        qpos = {q: k for k, q in enumerate(queries)}
+        scores = process.cdist(
+            queries, index.team_names(team_id), scorer=fuzz.token_sort_ratio,
+            dtype=np.float64, workers=-1,
+        )
+
+        for key in keys:
+            _, ids, _, keep = index.candidates(*key)
+            rows = pending[key]
+            sub = scores[[qpos[pnames[i]] for i in rows]][:, keep]
+            best = sub.argmax(axis=1)   # first best, same tie-break as extractOne
+            for i, j, sc in zip(rows, best, sub[np.arange(len(rows)), best]):
+                if sc >= cfg.threshold:
+                    out[i] = (ids[j], "fuzzy", int(sc))
+                else:
+                    out[i] = (pd.NA, "no_match", int(sc))
+
+    res = pd.DataFrame(out, index=df.index, columns=[0, 1, 2])
     df[cfg.out_col] = res[0]
     df["_id_source"] = res[1]
     df["_id_score"] = res[2]
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+
+def asof_join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    cols: list,
+    left_on: str,
+    left_by: str,
+    right_on: str | None = None,
+    right_by: str | None = None,
+    strict: bool = True,
+) -> pd.DataFrame:
+    """
+    For every row of `left`, the `cols` of the latest `right` row with the same
+    key (left_by == right_by) and an earlier date (right_on < left_on).
+
+    strict=True keeps the training anti-leakage rule: a rating dated on the match
+    day itself is not used. Rows with a missing key/date, or with no earlier
+    right row, get NaN. The result is aligned to left.index. When several right
+    rows share the latest date, the last one in `right` order wins.
+    """
+    right_on = right_on or left_on
+    right_by = right_by or left_by
+
+    r = right.loc[right[right_on].notna() & right[right_by].notna(), [right_by, right_on] + list(cols)]
+    r = r.rename(columns={right_by: "_by", right_on: "_on"}).sort_values("_on", kind="stable")
+
+    ok = left[left_on].notna() & left[left_by].notna()
+    l = pd.DataFrame({
+        "_row": range(int(ok.sum())),
+        "_by": left.loc[ok, left_by].astype(r["_by"].dtype),
+        "_on": left.loc[ok, left_on],
+    }).sort_values("_on", kind="stable")
+
+    m = pd.merge_asof(l, r, on="_on", by="_by", direction="backward", allow_exact_matches=not strict)
+
+    out = pd.DataFrame(index=left.index, columns=list(cols), dtype=object)
+    if len(m):
+        out.loc[ok] = m.set_index("_row").sort_index()[list(cols)].to_numpy()
+    return out.infer_objects()
+
+
+class SquadIndex:
+    """
+    Active squads per team as a step function of time, built from team_roster stints.
+
+    A stint [stint_start, stint_end] is active on both end days; a missing
+    stint_end means it is still open, and stints without a start are ignored
+    (matching the old `stint_start <= date <= stint_end` filter). Per team, the
+    sorted stint starts and (end + 1ns) stops cut the timeline into intervals
+    over which the squad is constant, so a match only needs a binary search to
+    find its squad. Overlapping stints of the same player for the same team are
+    merged first, so a player is counted once however many rows they have.
+    """
+
+    def __init__(self, roster: pd.DataFrame, team_id: str = "team_id", player_id: str = "player_id",
+                 start: str = "stint_start", end: str = "stint_end"):
+        r = roster.loc[roster[start].notna() & roster[team_id].notna(), [team_id, player_id, start, end]]
+        r = r.set_axis(["team", "player", "start", "end"], axis=1)
+        # open stints never stop
+        r["stop"] = (r["end"] + pd.Timedelta(1, "ns")).fillna(pd.Timestamp.max)
+        r = r.sort_values(["team", "player", "start"], kind="stable")
+
+        # a stint starting before every earlier stint of the player has stopped extends that block
+        keys = [r["team"], r["player"]]
+        reach = r.groupby(keys)["stop"].shift().groupby(keys).cummax()
+        r["block"] = (~(r["start"] < reach)).cumsum()
+        blocks = r.groupby("block").agg(team=("team", "first"), player=("player", "first"),
+                                         start=("start", "min"), stop=("stop", "max"))
+
+        self.boundaries = {}
+        self.blocks = {}
+        for tid, g in blocks.groupby("team"):
+            stops = g["stop"][g["stop"] != pd.Timestamp.max]
+            b = np.unique(np.concatenate([g["start"].to_numpy(), stops.to_numpy()]))
+            self.boundaries[tid] = b
+            # player is in intervals first..last-1; still-open stints run past the last boundary
+            last = np.searchsorted(b, g["stop"].to_numpy())
+            self.blocks[tid] = pd.DataFrame({
+                "player": g["player"].to_numpy(),
+                "first": np.searchsorted(b, g["start"].to_numpy()),
+                "last": last,
+            })
+
+    def intervals(self, team_ids, dates) -> np.ndarray:
+        """Interval number of each (team, date); -1 before the team's first stint or for unknown teams/dates."""
+        team_ids = pd.Series(np.asarray(team_ids, dtype=object))
+        dates = pd.to_datetime(pd.Series(np.asarray(dates)))
+        out = np.full(len(team_ids), -1, dtype=np.int64)
+        for tid, pos in team_ids.groupby(team_ids, sort=False).indices.items():
+            b = self.boundaries.get(tid)
+            if b is None:
+                continue
+            d = dates.iloc[pos]
+            ok = d.notna().to_numpy()
+            out[pos[ok]] = np.searchsorted(b, d[ok].to_numpy(), side="right") - 1
+        return out
+
+    def members(self, team_ids, dates) -> pd.DataFrame:
+        """(row, player) for every player in the squad of each (team, date); row is the input position."""
+        team_ids = pd.Series(np.asarray(team_ids, dtype=object))
+        k = self.intervals(team_ids, dates)
+        parts = []
+        for tid, pos in team_ids.groupby(team_ids, sort=False).indices.items():
+            bl = self.blocks.get(tid)
+            if bl is None:
+                continue
+            kk = k[pos][:, None]
+            hit_row, hit_player = np.nonzero((bl["first"].to_numpy() <= kk) & (kk < bl["last"].to_numpy()))
+            parts.append(pd.DataFrame({"row": pos[hit_row], "player": bl["player"].to_numpy()[hit_player]}))
+        if not parts:
+            return pd.DataFrame({"row": pd.Series(dtype=np.int64), "player": pd.Series(dtype=object)})
+        return pd.concat(parts, ignore_index=True)
+
+    def point_in_time_mean(self, stats: pd.DataFrame, cols: list, team_ids, dates,
+                           player_id: str = "player_id", date: str = "date") -> pd.DataFrame:
+        """
+        Mean of `cols` over the squad active for each (team, date), using each
+        player's most recent `stats` snapshot strictly before that date. Players
+        with no earlier snapshot are left out; missing values are skipped per
+        column and squads with nothing to average get NaN. One row per input
+        pair, in input order.
+        """
+        dates = pd.to_datetime(pd.Series(np.asarray(dates)))
+        m = self.members(team_ids, dates)
+        m["date"] = dates.to_numpy()[m["row"].to_numpy()]
+
+        # as-of lookup keyed by player_id: same strict rule as the team ratings
+        snap = asof_join(m, stats, cols, left_on="date", left_by="player", right_on=date, right_by=player_id)
+        avg = snap.groupby(m["row"]).mean()
+        return avg.reindex(range(len(dates)))[list(cols)].reset_index(drop=True)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+## per-team form metrics: feature name -> match_team_stats column stem ('{stem}_home' / '{stem}_away')
+ROLLING_METRICS = {
+    "xg_for": "general_expected_goals",
+    "xg_against": "general_xg_conceded",
+    "shots": "general_shots",
+    "possession": "general_possession_pct",
+}
+
+WINDOWS = (3, 5, 10)
+EWM_SPANS = (5, 10)
+
+KEY_COLS = ["match_id", "date", "team", "is_home"]
+
+
+def team_match_rows(matches: pd.DataFrame, match_team_stats: pd.DataFrame,
+                    metrics: dict = ROLLING_METRICS) -> pd.DataFrame:
+    """
+    One row per (match, team) with the team's own side of each metric plus
+    points from the score, sorted by team and date.
+    """
+    stat_cols = [f"{stem}_{side}" for stem in metrics.values() for side in ("home", "away")]
+    stats = match_team_stats.reindex(columns=["match_id"] + stat_cols).drop_duplicates("match_id", keep="last")
+    m = matches[["match_id", "date", "home_team", "away_team", "home_score", "away_score"]].merge(
+        stats, on="match_id", how="left"
+    )
+
+    sides = []
+    for side, opp in (("home", "away"), ("away", "home")):
+        part = pd.DataFrame({
+            "match_id": m["match_id"],
+            "date": pd.to_datetime(m["date"]),
+            "team": m[f"{side}_team"],
+            "is_home": side == "home",
+        })
+        for name, stem in metrics.items():
+            part[name] = pd.to_numeric(m[f"{stem}_{side}"], errors="coerce")
+        gf = pd.to_numeric(m[f"{side}_score"], errors="coerce")
+        ga = pd.to_numeric(m[f"{opp}_score"], errors="coerce")
+        part["points"] = np.select([gf > ga, gf == ga], [3.0, 1.0], default=0.0)
+        part.loc[gf.isna() | ga.isna(), "points"] = np.nan
+        sides.append(part)
+
+    rows = pd.concat(sides, ignore_index=True)
+    rows = rows[rows["team"].notna() & rows["date"].notna()]
+    return rows.sort_values(["team", "date", "match_id"], kind="stable", ignore_index=True)
+
+
+class RollingForm:
+    """
+    Pre-match rolling form per team: mean of the last N matches and an
+    exponentially weighted mean (adjust=False, missing values skipped) for
+    every metric, always over matches *before* the one being described.
+
+    All matches go through one groupby-shift-rolling pass. To extend a season
+    week by week, update() only computes the new matches: it carries the last
+    max(windows) rows of each team (enough for every window) and each team's
+    current EWM value, so the result equals recomputing from scratch.
+    New matches must be later than everything already seen for their teams.
+    """
+
+    def __init__(self, metrics: dict = ROLLING_METRICS, windows=WINDOWS, spans=EWM_SPANS):
+        self.metrics = dict(metrics)
+        self.windows = tuple(windows)
+        self.spans = tuple(spans)
+        self.cols = list(self.metrics) + ["points"]
+
+        self.features = pd.DataFrame(columns=KEY_COLS + self.feature_names())
+        self.tail = pd.DataFrame(columns=KEY_COLS + self.cols)
+        self.ewm_state = pd.DataFrame(columns=["team"] + self.ewm_names())
+
+    def feature_names(self) -> list:
+        return [f"{c}_roll{w}" for w in self.windows for c in self.cols] + self.ewm_names()
+
+    def ewm_names(self) -> list:
+        return [f"{c}_ewm{s}" for s in self.spans for c in self.cols]
+
+    def fit(self, matches: pd.DataFrame, match_team_stats: pd.DataFrame) -> pd.DataFrame:
+        """Compute form for every match from scratch."""
+        self.__init__(self.metrics, self.windows, self.spans)
+        return self.update(matches, match_team_stats)
+
+    def update(self, matches: pd.DataFrame, match_team_stats: pd.DataFrame) -> pd.DataFrame:
+        """Add form rows for matches not seen yet and return just those rows."""
+        rows = team_match_rows(matches, match_team_stats, self.metrics)
+        rows = rows[~rows["match_id"].isin(self.features["match_id"])]
+        if rows.empty:
+            return self.features.iloc[:0]
+
+        frames = [rows.assign(_new=True)]
+        if len(self.tail):
+            last_seen = rows["team"].map(self.tail.groupby("team")["date"].max())
+            if (rows["date"] < last_seen).any():
+                raise ValueError("RollingForm.update: new matches predate ones already seen; call fit() instead.")
+            frames.insert(0, self.tail.assign(_new=False))
+
+        work = pd.concat(frames, ignore_index=True)
+        work = work.sort_values(["team", "date", "match_id"], kind="stable", ignore_index=True)
+        work[self.cols] = work[self.cols].astype(float)
+        team = work["team"]
+
+        # last-N means over the previous matches only
+        prev = work[self.cols].groupby(team).shift(1)
+        feats = work[KEY_COLS].copy()
+        for w in self.windows:
+            r = prev.groupby(team).rolling(w, min_periods=1).mean().reset_index(level=0, drop=True)
+            feats[[f"{c}_roll{w}" for c in self.cols]] = r.sort_index()[self.cols].to_numpy()
+
+        # EWM over [current state, new matches...]: seeding with the state continues the
+        # recursion exactly where the previous run stopped
+        new = work[work["_new"]]
+        seeds = self.ewm_state.set_index("team").reindex(pd.unique(new["team"])).astype(float)
+        ewm_pre, ewm_post = [], []
+        for s in self.spans:
+            names = [f"{c}_ewm{s}" for c in self.cols]
+            seed_rows = seeds[names].set_axis(self.cols, axis=1).rename_axis("team").reset_index()
+            seq = pd.concat([
+                seed_rows.assign(_seed=True, _pos=-1),
+                new[["team"] + self.cols].assign(_seed=False, _pos=new.index),
+            ], ignore_index=True).sort_values(["team", "_seed"], ascending=[True, False], kind="stable")
+            post = (
+                seq.groupby("team", sort=False)[self.cols]
+                .ewm(span=s, adjust=False, ignore_na=True).mean()
+                .reset_index(level=0, drop=True).reindex(seq.index)
+            )
+            pre = post.groupby(seq["team"]).shift(1)
+            keep = ~seq["_seed"].to_numpy(dtype=bool)
+            ewm_pre.append(pd.DataFrame(pre[keep].to_numpy(), index=seq["_pos"][keep].to_numpy(), columns=names))
+            ewm_post.append(post.groupby(seq["team"]).last().set_axis(names, axis=1))
+
+        out = feats.loc[new.index].join(pd.concat(ewm_pre, axis=1))[KEY_COLS + self.feature_names()]
+        out = out.reset_index(drop=True)
+
+        # carry state forward
+        self.features = pd.concat([self.features, out], ignore_index=True) if len(self.features) else out
+        self.tail = work.groupby("team", sort=False).tail(max(self.windows))[KEY_COLS + self.cols].reset_index(drop=True)
+        state = pd.concat(ewm_post, axis=1).rename_axis("team").reset_index()
+        self.ewm_state = (
+            pd.concat([self.ewm_state[~self.ewm_state["team"].isin(state["team"])], state], ignore_index=True)
+            if len(self.ewm_state) else state
+        )
+        return out
+
+    def match_features(self) -> pd.DataFrame:
+        """One row per match_id with '{feature}_home' / '{feature}_away' columns."""
+        names = self.feature_names()
+        home = self.features[self.features["is_home"].astype(bool)].set_index("match_id")[names]
+        away = self.features[~self.features["is_home"].astype(bool)].set_index("match_id")[names]
+        return home.add_suffix("_home").join(away.add_suffix("_away"), how="outer").reset_index()
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        self.features.to_parquet(path / "features.parquet", index=False)
+        self.tail.to_parquet(path / "tail.parquet", index=False)
+        self.ewm_state.to_parquet(path / "ewm_state.parquet", index=False)
+
+    @classmethod
+    def load(cls, path: Path, metrics: dict = ROLLING_METRICS, windows=WINDOWS, spans=EWM_SPANS) -> "RollingForm":
+        path = Path(path)
+        form = cls(metrics, windows, spans)
+        if (path / "features.parquet").exists():
+            form.features = pd.read_parquet(path / "features.parquet")
+            form.tail = pd.read_parquet(path / "tail.parquet")
+            form.ewm_state = pd.read_parquet(path / "ewm_state.parquet")
+        return form
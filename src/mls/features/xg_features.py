@@ -0,0 +1,187 @@
+from __future__ import annotations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mls.cleaning.matches.clean_match_players import team_map
+from mls.utils.names import norm_name, norm_team, normalize_series
+
+XG_CACHE_PATH = Path("data/features/xg_features.parquet")
+
+## full club names as they appear in feed comments, beyond the ones in team_map
+FEED_TEAM_ALIASES = {
+    "Red Bull New York": "RBNY",
+}
+FEED_TEAM_MAP = {norm_team(k): v for k, v in {**team_map, **FEED_TEAM_ALIASES}.items()}
+
+## 15-minute windows by the minute before any stoppage time ("45'+3" counts as 30-45)
+BUCKETS = ["0_15", "15_30", "30_45", "45_60", "60_75", "75_90"]
+STATES = ["leading", "level", "trailing"]
+
+_minute = r"^(?P<base>\d+)'(?:\+(?P<added>\d+))?"
+_xg = r"with an xG of (?P<xg>\d+(?:\.\d+)?)%"
+_team = r"\((?P<team>[^)]+)\)"
+_score = r"(?i)goal! (?P<h>\d+):(?P<a>\d+)"
+_player_team = r"(?P<player>[A-Z][^.,()]*?)(?:'s)? \((?P<team>[^)]+)\)"
+_sub = r"^Substitution: (?P<out>.*) out, (?P<inn>.*) in$"
+
+
+def feature_names() -> list:
+    return (
+        [f"xg_{b}" for b in BUCKETS] + [f"shots_{b}" for b in BUCKETS]
+        + [f"xg_{s}" for s in STATES] + [f"shots_{s}" for s in STATES]
+        + ["xg_post_sub", "shots_post_sub", "subs", "first_sub_minute", "xg_feed_total", "xg_feed_coverage"]
+    )
+
+
+def _initial_key(s: pd.Series) -> pd.Series:
+    # "Mohamed Fofana" and "M. Fofana" both -> "m fofana", so substitutions can borrow a player's team
+    n = normalize_series(s, norm_name)
+    parts = n.str.split(" ")
+    return (parts.str[0].str[:1] + " " + parts.str[-1]).where(n.str.len() > 0)
+
+
+def parse_events(events: pd.DataFrame, matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-event columns from match_events: side ('home'/'away'), shot xG, minute
+    bucket, score state before the event (from the side's view) and whether the
+    side had already made a substitution.
+    """
+    ev = events[["match_id", "event_id", "event_minute", "event_type", "event_comment"]]
+    ev = ev.merge(matches[["match_id", "home_team", "away_team"]], on="match_id", how="inner")
+    ev = ev.sort_values(["match_id", "event_id"], kind="stable", ignore_index=True)
+    comment = ev["event_comment"].fillna("").astype(str)
+
+    minute = ev["event_minute"].astype(str).str.extract(_minute)
+    base = pd.to_numeric(minute["base"], errors="coerce")
+    ev["minute"] = base
+    ev["bucket"] = ((base - 1).clip(lower=0) // 15).clip(upper=len(BUCKETS) - 1)
+
+    # team: first "(Club Name)" in the comment is the acting player's club
+    abbr = normalize_series(comment.str.extract(_team)["team"], norm_team).map(FEED_TEAM_MAP)
+    side = np.select([abbr.eq(ev["home_team"]), abbr.eq(ev["away_team"])], ["home", "away"], default="")
+
+    # substitutions name players by initial; take their club from other events in the same match
+    is_sub = ev["event_type"].eq("Substitution")
+    if is_sub.any():
+        named = comment.str.extractall(_player_team).reset_index(level=1, drop=True)
+        named["match_id"] = ev.loc[named.index, "match_id"].to_numpy()
+        named["abbr"] = normalize_series(named["team"], norm_team).map(FEED_TEAM_MAP)
+        named["key"] = _initial_key(named["player"])
+        named = named.dropna(subset=["abbr", "key"]).drop_duplicates(["match_id", "key", "abbr"])
+        named = named.drop_duplicates(["match_id", "key"], keep=False)    # ambiguous initials: leave unassigned
+        club = named.set_index(["match_id", "key"])["abbr"]
+
+        subs = comment[is_sub].str.extract(_sub)
+        sub_abbr = None
+        for col in ("out", "inn"):
+            k = pd.MultiIndex.from_arrays([ev.loc[is_sub, "match_id"], _initial_key(subs[col])])
+            found = pd.Series(club.reindex(k).to_numpy(), index=subs.index)
+            sub_abbr = found if sub_abbr is None else sub_abbr.fillna(found)
+        sub_side = np.select(
+            [sub_abbr.eq(ev.loc[is_sub, "home_team"]), sub_abbr.eq(ev.loc[is_sub, "away_team"])],
+            ["home", "away"], default="",
+        )
+        side[is_sub.to_numpy()] = sub_side
+    ev["side"] = side
+
+    ev["xg"] = pd.to_numeric(comment.str.extract(_xg)["xg"], errors="coerce") / 100
+    ev["shot"] = ev["xg"].notna() & ev["side"].ne("")
+
+    # score before each event: the last "Goal! h:a" strictly earlier in the match
+    score = comment.str.extract(_score).apply(pd.to_numeric)
+    before = score.groupby(ev["match_id"]).shift(1)
+    before = before.groupby(ev["match_id"]).ffill().fillna(0)
+    diff = np.where(ev["side"].eq("away"), before["a"] - before["h"], before["h"] - before["a"])
+    ev["state"] = np.select([diff > 0, diff < 0], ["leading", "trailing"], default="level")
+
+    # after the side's first substitution
+    sub_id = ev["event_id"].where(is_sub & ev["side"].ne(""))
+    first_sub = sub_id.groupby([ev["match_id"], ev["side"]]).transform("min")
+    ev["post_sub"] = ev["event_id"] > first_sub
+    ev["is_sub"] = is_sub & ev["side"].ne("")
+    return ev
+
+
+def compute_xg_features(events: pd.DataFrame, matches: pd.DataFrame,
+                        match_team_stats: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    One row per match_id with '{feature}_home' / '{feature}_away' columns for
+    every match that has feed events, built with a single groupby over
+    (match_id, side).
+    """
+    ev = parse_events(events, matches)
+    ev = ev[ev["side"].ne("")]
+    xg = ev["xg"].where(ev["shot"], 0.0)
+    shot = ev["shot"].astype(float)
+
+    cols = {}
+    for k, b in enumerate(BUCKETS):
+        in_b = ev["bucket"].eq(k)
+        cols[f"xg_{b}"] = xg.where(in_b, 0.0)
+        cols[f"shots_{b}"] = shot.where(in_b, 0.0)
+    for s in STATES:
+        in_s = ev["state"].eq(s)
+        cols[f"xg_{s}"] = xg.where(in_s, 0.0)
+        cols[f"shots_{s}"] = shot.where(in_s, 0.0)
+    cols["xg_post_sub"] = xg.where(ev["post_sub"], 0.0)
+    cols["shots_post_sub"] = shot.where(ev["post_sub"], 0.0)
+    cols["subs"] = ev["is_sub"].astype(float)
+    cols["first_sub_minute"] = ev["minute"].where(ev["is_sub"])
+    cols["xg_feed_total"] = xg
+
+    per_side = pd.DataFrame(cols).groupby([ev["match_id"], ev["side"]]).agg(
+        {c: ("min" if c == "first_sub_minute" else "sum") for c in cols}
+    )
+    wide = per_side.unstack("side")
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([list(cols), ["home", "away"]]))
+    wide.columns = [f"{c}_{s}" for c, s in wide.columns]
+
+    match_ids = pd.unique(events["match_id"][events["match_id"].isin(matches["match_id"])])
+    wide = wide.reindex(match_ids)
+    sums = [c for c in wide.columns if not c.startswith("first_sub_minute")]
+    wide[sums] = wide[sums].fillna(0.0)
+
+    # how much of the official team xG the feed's shot events account for
+    for s in ("home", "away"):
+        total = None
+        if match_team_stats is not None and f"xg_total_team_xg_{s}" in match_team_stats.columns:
+            total = pd.to_numeric(
+                match_team_stats.drop_duplicates("match_id", keep="last")
+                .set_index("match_id")[f"xg_total_team_xg_{s}"], errors="coerce",
+            ).reindex(wide.index)
+        wide[f"xg_feed_coverage_{s}"] = (
+            wide[f"xg_feed_total_{s}"] / total.where(total > 0) if total is not None else np.nan
+        )
+
+    order = [f"{c}_{s}" for c in feature_names() for s in ("home", "away")]
+    return wide[order].rename_axis("match_id").reset_index()
+
+
+def build_xg_features(events: pd.DataFrame, matches: pd.DataFrame,
+                      match_team_stats: pd.DataFrame | None = None,
+                      cache_path: Path | None = XG_CACHE_PATH, refresh: bool = False) -> pd.DataFrame:
+    """
+    xG features for every match in `matches`, computing only match_ids that are
+    not in the parquet cache yet (all of them with refresh=True) and appending
+    those to it.
+    """
+    cached = None
+    if cache_path is not None and Path(cache_path).exists() and not refresh:
+        cached = pd.read_parquet(cache_path)
+
+    todo = matches
+    if cached is not None:
+        todo = matches[~matches["match_id"].isin(cached["match_id"])]
+
+    new = compute_xg_features(events[events["match_id"].isin(todo["match_id"])], todo, match_team_stats)
+    if cached is not None and len(new):
+        out = pd.concat([cached, new], ignore_index=True)
+    else:
+        out = new if cached is None else cached
+
+    if cache_path is not None and (len(new) or refresh):
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        out.to_parquet(cache_path, index=False)
+    return out[out["match_id"].isin(matches["match_id"])].reset_index(drop=True)
@@ -3,12 +3,27 @@ helpers.py — Utilities, constants, and shared tools for the MLS pipeline
 """
 from __future__ import annotations
 from datetime import datetime
+import base64
+import json
+import os
+import sqlite3
+import threading
 import time
+import weakref
 from pathlib import Path
 from typing import Optional
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import requests
+
+from mls.scraping.bs4.bs_scraper import get_session
+from mls.utils.scraping.html_cache import HtmlCache, cache_key, canonical_url, default_cache
+from mls.utils.names import norm_team, normalize_series
+from mls.utils.scraping.io import FLUSH_EVERY, FlushError, FrameSink
 
 # ─────────────────────────────────────────────
 # Constants
@@ -110,7 +125,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import re
 
-def set_up_driver():
+def set_up_driver(log_path: str = "chromedriver.log", capture_network: bool = False):
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
@@ -125,7 +140,11 @@ def set_up_driver():
     )
     
     
-    log_file = open("chromedriver.log", "w", encoding="utf-8")
+    if capture_network:
+        # DevTools performance log → Network.* events, read back by NetworkCapture
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    log_file = open(log_path, "w", encoding="utf-8")
     service = Service(log_output=log_file) 
 
     driver = webdriver.Chrome(service=service, options=options)
@@ -133,31 +152,95 @@ def set_up_driver():
     driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
     "source": "Object.defineProperty(navigator,'webdriver',{get:()=>undefined})"
     })
+
+    if capture_network:
+        driver.execute_cdp_cmd("Network.enable", {})
     
     return driver
 
 
-def dismiss_cookies(driver):
-    time.sleep(2)
-    try:
-        btn = driver.find_element(By.ID, "onetrust-accept-btn-handler")
-        driver.execute_script("arguments[0].click();", btn)
-        print("  [COOKIES] dismissed via JS click")
-        time.sleep(0.5)
-        return
-    except:
-        pass
-    # fallback — nuke from DOM
-    try:
-        driver.execute_script("""
-            ['onetrust-banner-sdk', 'onetrust-pc-sdk', 'onetrust-button-group'].forEach(function(id) {
-                var el = document.getElementById(id);
-                if (el) el.remove();
-            });
-        """)
-        print("  [COOKIES] dismissed via DOM removal")
-    except:
-        pass
+# ─────────────────────────────────────────────
+# Readiness waits and session consent — shared with the package scrapers
+# ─────────────────────────────────────────────
+from mls.utils.scraping.selenium_helpers import (
+    COOKIE_BANNER_ID, MATCH_HEADER_CSS, READY_POLL, READY_TIMEOUT, SCHEDULE_CLASS, STATS_CARD_XPATH,
+    ConsentManager, consent_cookies, consent_for, dismiss_cookies, ensure_consent, schedule_hrefs, wait_for,
+    wait_for_cookie_banner_gone, wait_for_match_header, wait_for_schedule, wait_for_schedule_update,
+    wait_for_stats_module,
+)
+
+
+# ─────────────────────────────────────────────
+# Network capture — JSON payloads the React match hub fetches
+# ─────────────────────────────────────────────
+
+API_HOSTS = ("stats-api.mlssoccer.com", "sportapi.mlssoccer.com")
+
+
+class NetworkCapture:
+    """Collects JSON responses from the API hosts out of the DevTools performance log.
+    The driver must be built with set_up_driver(capture_network=True)."""
+
+    def __init__(self, driver, hosts=API_HOSTS):
+        self.driver = driver
+        self.hosts = hosts
+        self.pending = {}      # requestId → url, response seen but body not finished loading
+        self.payloads = []     # (url, parsed json)
+
+    def reset(self):
+        # get_log drains the buffer, so this drops everything from the previous page
+        self.poll(fetch=False)
+        self.pending.clear()
+        self.payloads.clear()
+
+    def poll(self, fetch: bool = True) -> list:
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            return self.payloads
+
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = msg.get("method"), msg.get("params", {})
+
+            if method == "Network.responseReceived":
+                resp = params.get("response", {})
+                url = resp.get("url", "")
+                if "json" in (resp.get("mimeType") or "") and any(h in url for h in self.hosts):
+                    self.pending[params["requestId"]] = url
+            elif method == "Network.loadingFinished" and fetch:
+                url = self.pending.pop(params.get("requestId"), None)
+                if url is not None:
+                    payload = self.fetch_body(params["requestId"])
+                    if payload is not None:
+                        self.payloads.append((url, payload))
+        return self.payloads
+
+    def fetch_body(self, request_id):
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException:
+            return None
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8", errors="replace")
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+
+_network_captures = weakref.WeakKeyDictionary()
+
+
+def network_capture(driver) -> NetworkCapture:
+    capture = _network_captures.get(driver)
+    if capture is None:
+        capture = _network_captures[driver] = NetworkCapture(driver)
+    return capture
 
 
 # Function to scroll by a certain amount of pixels
@@ -244,6 +327,29 @@ def get_html_text(el) -> Optional[str]:
     return t if t else None
 
 
+# ─────────────────────────────────────────────
+# HTTP session — pooled, for the no-browser fetch mode
+# ─────────────────────────────────────────────
+HTTP_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                   "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def http_session() -> requests.Session:
+    """The package-wide pooled session (bs_scraper.get_session), shared with scrape_sofifa."""
+    return get_session()
+
+
+def http_get(session: requests.Session, url: str, timeout: float) -> requests.Response:
+    # headers and consent cookies go on the request, so the shared session itself is left untouched;
+    # OneTrust reads the same consent cookies over plain HTTP
+    cookies = {c["name"]: c["value"] for c in consent_cookies()}
+    return session.get(url, headers=HTTP_HEADERS, cookies=cookies, timeout=timeout)
+
+
 # ─────────────────────────────────────────────
 # Hashing — TODO: fill in
 # ─────────────────────────────────────────────
@@ -305,25 +411,600 @@ def write_csv(df: pd.DataFrame, path: Path):
     print(f"  [SAVED] {path} ({len(df)} rows)")
 
 
-def append_to_master(df: pd.DataFrame, key: str):
+RECOVERY_DIR = RAW_BASE / "recovery"
+
+
+def save_recovery(chunk: dict, tags: list) -> Path:
+    """
+    Dump rows that could not be flushed to <RECOVERY_DIR>/<timestamp>/, one CSV
+    per key, plus links.csv with their URLs (usable as --url-list to re-scrape).
+    """
+    out = RECOVERY_DIR / datetime.now().strftime("%Y%m%dT%H%M%S")
+    for key, df in chunk.items():
+        if df is not None and not df.empty:
+            write_csv(df, out / f"{key}.csv")
+    if tags:
+        write_csv(pd.DataFrame({"url": tags}), out / "links.csv")
+    print(f"[RECOVERY] unsaved rows written to {out}")
+    return out
+
+
+def append_csv(df: pd.DataFrame, path: Path):
+    """Append to a dated CSV, writing the header only when the file is new."""
     if df is None or df.empty:
         return
+    df = df.loc[:, ~df.columns.duplicated()]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        header = master_header(path)
+        if not set(df.columns) <= set(header):
+            # player tables gain stat columns between chunks: widen the file with one rewrite
+            old = pd.read_csv(path, low_memory=False)
+            pd.concat([old, df], ignore_index=True).to_csv(path, index=False)
+            print(f"  [SAVED] {path} (+{len(df)} rows, schema widened)")
+            return
+        df.reindex(columns=header).to_csv(path, mode="a", header=False, index=False)
+    else:
+        df.to_csv(path, index=False)
+    print(f"  [SAVED] {path} (+{len(df)} rows)")
+
+
+# Masters are append-only: each batch appends its rows, and a sidecar
+# "<master>.keys" file holds one dedup key per CSV row, in the same order.
+# Re-scraped rows are appended as well; compaction later keeps the last copy
+# of each key. Per-batch cost therefore no longer grows with the master's size.
+
+COMPACT_STALE_ROWS  = 5000   # compact once this many superseded rows pile up...
+COMPACT_STALE_RATIO = 0.10   # ...or once they are this share of the file
+
+KEY_SEP = "\x1f"
+
+_key_index: dict = {}   # key -> {"keys": set, "rows": int}
+
+
+def key_index_path(master_path: Path) -> Path:
+    return master_path.with_suffix(".keys")
 
+
+def dedup_key_strings(df: pd.DataFrame, dedup_keys: list) -> pd.Series:
+    parts = df[dedup_keys].astype(str).where(df[dedup_keys].notna(), "")
+    return parts.agg(KEY_SEP.join, axis=1) if len(dedup_keys) > 1 else parts[dedup_keys[0]]
+
+
+def rebuild_key_index(key: str) -> dict:
+    """Recreate the .keys sidecar from the master's dedup columns (first run, or after a manual edit)."""
     master_path = MASTER_FILES[key]
     dedup_keys  = DEDUP_KEYS[key]
+    keys = dedup_key_strings(pd.read_csv(master_path, usecols=dedup_keys, dtype=str), dedup_keys)
+    key_index_path(master_path).write_text("".join(k + "\n" for k in keys), encoding="utf-8")
+    return {"keys": set(keys), "rows": len(keys)}
+
+
+def load_key_index(key: str) -> dict:
+    if key in _key_index:
+        return _key_index[key]
+
+    master_path = MASTER_FILES[key]
+    index_path  = key_index_path(master_path)
+
+    if not master_path.exists():
+        index = {"keys": set(), "rows": 0}
+    elif index_path.exists():
+        lines = index_path.read_text(encoding="utf-8").splitlines()
+        index = {"keys": set(lines), "rows": len(lines)}
+    else:
+        index = rebuild_key_index(key)
+
+    _key_index[key] = index
+    return index
+
+
+def master_header(master_path: Path) -> list:
+    with open(master_path, encoding="utf-8") as f:
+        return f.readline().rstrip("\r\n").split(",")
+
+
+def compact_master(key: str):
+    """Rewrite a master keeping the last row per dedup key, and reset its key index."""
+    master_path = MASTER_FILES[key]
+    if not master_path.exists():
+        return
+
+    master = pd.read_csv(master_path, low_memory=False)
+    before = len(master)
+    master = master.drop_duplicates(subset=DEDUP_KEYS[key], keep="last")
+    master.to_csv(master_path, index=False)
+    _key_index[key] = rebuild_key_index(key)
+    print(f"  [COMPACT] {master_path.name}: {before} → {len(master)} rows")
+
+
+def compact_masters():
+    """Compact every master that has superseded rows; run once at the end of a pipeline run."""
+    if MASTER_STORE != "csv":
+        return  # parquet partitions are deduplicated as they are written
+    for key in MASTER_FILES:
+        index = load_key_index(key)
+        if index["rows"] > len(index["keys"]):
+            compact_master(key)
+
+
+def append_to_master_csv(df: pd.DataFrame, key: str):
+    if df is None or df.empty:
+        return
+
+    master_path = MASTER_FILES[key]
+    dedup_keys  = DEDUP_KEYS[key]
+
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df.drop_duplicates(subset=dedup_keys, keep="last")
+    index = load_key_index(key)
 
     if master_path.exists():
-        master = pd.read_csv(master_path, low_memory=False)
-        # deduplicate columns before concat
-        master = master.loc[:, ~master.columns.duplicated()]
-        df = df.loc[:, ~df.columns.duplicated()]
-        combined = pd.concat([master, df], ignore_index=True)
+        header = master_header(master_path)
+        if not set(df.columns) <= set(header):
+            # new columns: widen the file once with a full rewrite, then go back to appending
+            master = pd.read_csv(master_path, low_memory=False)
+            master = master.loc[:, ~master.columns.duplicated()]
+            combined = pd.concat([master, df], ignore_index=True)
+            combined = combined.drop_duplicates(subset=dedup_keys, keep="last")
+            combined.to_csv(master_path, index=False)
+            _key_index[key] = rebuild_key_index(key)
+            print(f"  [MASTER] {master_path.name} → {len(combined)} total rows (schema widened)")
+            return
+        df.reindex(columns=header).to_csv(master_path, mode="a", header=False, index=False)
+    else:
+        master_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(master_path, index=False)
+
+    batch_keys = dedup_key_strings(df, dedup_keys)
+    with open(key_index_path(master_path), "a", encoding="utf-8") as f:
+        f.write("".join(k + "\n" for k in batch_keys))
+
+    index["keys"].update(batch_keys)
+    index["rows"] += len(batch_keys)
+
+    stale = index["rows"] - len(index["keys"])
+    print(f"  [MASTER] {master_path.name} → {len(index['keys'])} total rows "
+          f"(+{len(df)} appended, {stale} superseded)")
+
+    if stale >= COMPACT_STALE_ROWS or stale > COMPACT_STALE_RATIO * index["rows"]:
+        compact_master(key)
+
+
+# ─────────────────────────────────────────────
+# Checkpoint journal — per-URL progress for resumable historical runs
+# ─────────────────────────────────────────────
+
+JOURNAL_PATH = URL_LIST_PATH.with_suffix(".journal.sqlite")
+
+
+class CheckpointJournal:
+    """
+    SQLite record of every historical URL: status, attempts, last error and timings.
+
+    Status moves pending → running → done | failed. A URL is only marked done
+    after the FrameSink flush that saved its rows, so a crash at any point
+    loses at most the unflushed chunk, and `running` rows left by a crash are
+    treated as retries on the next run.
+    """
+
+    def __init__(self, path: Path = JOURNAL_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS links (
+                url         TEXT PRIMARY KEY,
+                match_id    TEXT NOT NULL,
+                status      TEXT NOT NULL DEFAULT 'pending',
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                last_error  TEXT,
+                started_at  REAL,
+                finished_at REAL,
+                seconds     REAL
+            )
+        """)
+
+    def _exec(self, sql: str, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def register(self, links: list):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO links (url, match_id) VALUES (?, ?)",
+                [(link, make_match_id(link)) for link in links],
+            )
+
+    def resume_order(self, links: list) -> list:
+        """Links still to do: retries first (fewest attempts first), then never-tried links in list order."""
+        self.register(links)
+        state = {url: (status, attempts) for url, status, attempts in
+                 self._exec("SELECT url, status, attempts FROM links")}
+        position = {link: i for i, link in enumerate(links)}
+
+        todo = [link for link in links if state[link][0] != "done"]
+        retries = sorted((l for l in todo if state[l][1] > 0), key=lambda l: (state[l][1], position[l]))
+        fresh = [l for l in todo if state[l][1] == 0]
+        return retries + fresh
+
+    def started(self, link: str):
+        self.register([link])
+        self._exec("UPDATE links SET status = 'running', attempts = attempts + 1, started_at = ? "
+                   "WHERE url = ?", (time.time(), link))
+
+    def failed(self, link: str, error: str):
+        now = time.time()
+        self._exec("UPDATE links SET status = 'failed', last_error = ?, finished_at = ?, "
+                   "seconds = ? - started_at WHERE url = ?", (error[:500], now, now, link))
+
+    def scraped(self, link: str):
+        # scrape time only; the link stays `running` until its chunk is flushed
+        self._exec("UPDATE links SET seconds = ? - started_at WHERE url = ?", (time.time(), link))
+
+    def done(self, links: list):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "UPDATE links SET status = 'done', last_error = NULL, finished_at = ? WHERE url = ?",
+                [(now, link) for link in links],
+            )
+
+    def summary(self) -> dict:
+        return dict(self._exec("SELECT status, COUNT(*) FROM links GROUP BY status"))
+
+
+# ─────────────────────────────────────────────
+# Parquet master store — typed, partitioned by season/date
+# ─────────────────────────────────────────────
+
+PARQUET_BASE = RAW_BASE / "parquet"
+
+MASTER_DATASETS = {key: PARQUET_BASE / f"master_{key}" for key in PATHS}
+RAW_DATASETS    = {key: PARQUET_BASE / f"raw_{key}"    for key in PATHS}
+
+CSV_IMPORT_MARKER = "_csv_import.json"
+
+
+def resolve_master_store() -> str:
+    """
+    Store used when MLS_MASTER_STORE is unset: the legacy CSV masters while
+    they exist and have never been imported (so an existing install keeps
+    updating them), Parquet otherwise.
+    """
+    legacy   = any(path.exists() for path in MASTER_FILES.values())
+    imported = any((path / CSV_IMPORT_MARKER).exists() for path in MASTER_DATASETS.values())
+    return "csv" if legacy and not imported else "parquet"
+
+
+# "parquet" or "csv" for the legacy append-only master CSVs; see resolve_master_store
+MASTER_STORE = os.getenv("MLS_MASTER_STORE") or resolve_master_store()
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("season", pa.int32()), ("date", pa.string())]), flavor="hive"
+)
+PARTITION_COLS = ["season", "date"]
+
+# identifier/text columns per key; every other master column is stored as float64
+# when all its values are numeric, and as string otherwise
+STRING_COLUMNS = {
+    "outfield":   ["match_id", "player_name", "club", "side", "position"],
+    "gk":         ["match_id", "player_name", "club", "side", "position"],
+    "team_stats": ["match_id"],
+    "feed":       ["match_id", "event_minute", "event_type", "event_comment"],
+    "match_data": ["match_id", "home_team", "away_team"],
+}
+INT_COLUMNS = {
+    "outfield":   [],
+    "gk":         ["minutes", "gk_goals_saved", "gk_goals_against", "gk_throws", "gk_long_balls",
+                   "gk_launches", "fouls", "fouls_against", "yellow_card", "red_card", "corners_conceded"],
+    "team_stats": [],
+    "feed":       ["event_id"],
+    "match_data": [],
+}
+
+
+def typed_table(df: pd.DataFrame, key: str = None) -> pa.Table:
+    """Arrow table with stable per-key types; key=None keeps every column as text (raw backups)."""
+    df = df.loc[:, ~df.columns.duplicated()].reset_index(drop=True)
+    fields, arrays = [], []
+    for col in df.columns:
+        s = df[col]
+        if col in PARTITION_COLS:
+            continue
+        if key is None or col in STRING_COLUMNS.get(key, []):
+            typ, values = pa.string(), s.astype("string")
+        elif s.isna().all():
+            typ, values = pa.null(), [None] * len(s)
+        else:
+            num = pd.to_numeric(s, errors="coerce")
+            if num.notna().sum() < s.notna().sum():
+                typ, values = pa.string(), s.astype("string")
+            elif col in INT_COLUMNS.get(key, []):
+                typ, values = pa.int64(), num.astype("Int64")
+            else:
+                typ, values = pa.float64(), num.astype(float)
+        fields.append(pa.field(str(col), typ))
+        arrays.append(pa.array(values, type=typ, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def unified_schema(files: list) -> pa.Schema:
+    """Merge the per-file schemas of a dataset; columns whose types disagree are read as string."""
+    types = {}
+    for f in files:
+        for field in pq.read_schema(f):
+            types.setdefault(field.name, set()).add(field.type)
+
+    fields = []
+    for name, ts in types.items():
+        if name in PARTITION_COLS:
+            continue
+        ts = {t for t in ts if t != pa.null()}
+        if not ts:
+            typ = pa.null()
+        elif len(ts) == 1:
+            typ = ts.pop()
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in ts):
+            typ = pa.float64()
+        else:
+            typ = pa.string()
+        fields.append(pa.field(name, typ))
+    return pa.schema(fields + list(PARTITIONING.schema))
+
+
+def open_dataset(path: Path):
+    if not path.exists():
+        return None
+    files = [str(f) for f in path.rglob("*.parquet")]
+    if not files:
+        return None
+    return ds.dataset(files, format="parquet", partitioning=PARTITIONING,
+                      partition_base_dir=str(path), schema=unified_schema(files))
+
+
+def load_dataset(path: Path, columns: list = None, filters=None) -> pd.DataFrame:
+    """
+    Read a partitioned dataset with column projection and predicate pushdown.
+
+    filters uses the pyarrow.parquet tuple form, e.g.
+    [("season", "=", 2025), ("club", "=", "NYC")].
+    """
+    dataset = open_dataset(path)
+    if dataset is None:
+        return pd.DataFrame(columns=columns or [])
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+    expr = pq.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+def filter_columns(filters) -> set:
+    """Columns named in a pyarrow.parquet filter (a list of tuples, or a list of such lists)."""
+    groups = filters if isinstance(filters[0], list) else [filters]
+    return {f[0] for group in groups for f in group}
+
+
+def load_master_csv(key: str, columns: list = None, filters=None) -> pd.DataFrame:
+    """The legacy CSV master, with the same filters as the Parquet path; there are no season/date partitions here."""
+    path = MASTER_FILES[key]
+    if not path.exists():
+        return pd.DataFrame(columns=columns or [])
+
+    needed = None
+    if columns is not None:
+        needed = set(columns) | (filter_columns(filters) if filters else set())
+    df = pd.read_csv(path, usecols=lambda c: needed is None or c in needed, low_memory=False)
+
+    if filters:
+        missing = filter_columns(filters) - set(df.columns)
+        if missing:
+            raise ValueError(f"load_master({key!r}): cannot filter {path.name} on missing column(s) {sorted(missing)}")
+        # evaluate the filter in Arrow on just the filtered columns, then keep the matching rows
+        cols = sorted(filter_columns(filters))
+        probe = pa.Table.from_pandas(df[cols].assign(_row=range(len(df))), preserve_index=False)
+        rows = probe.filter(pq.filters_to_expression(filters)).column("_row").to_numpy()
+        df = df.iloc[rows].reset_index(drop=True)
+
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+
+def load_master(key: str, columns: list = None, filters=None) -> pd.DataFrame:
+    if MASTER_STORE == "csv":
+        return load_master_csv(key, columns=columns, filters=filters)
+    import_csv_masters()
+    return load_dataset(MASTER_DATASETS[key], columns=columns, filters=filters)
+
+
+def match_dates(df: pd.DataFrame, dates: dict = None) -> pd.Series:
+    """Match date per row, from the frame itself, the given match_id→date map or the match_data master."""
+    if "date" in df.columns:
+        out = df["date"]
     else:
-        combined = df.loc[:, ~df.columns.duplicated()].copy()
+        dates = dict(dates or {})
+        missing = set(df["match_id"].dropna().astype(str)) - set(dates)
+        if missing:
+            known = load_dataset(MASTER_DATASETS["match_data"], columns=["match_id", "date"],
+                                 filters=[("match_id", "in", sorted(missing))])
+            dates.update(zip(known["match_id"].astype(str), known["date"]))
+        out = df["match_id"].astype(str).map(dates)
+    return pd.to_datetime(out, errors="coerce")
+
+
+def partition_frame(df: pd.DataFrame, dates: dict = None) -> pd.DataFrame:
+    df = df.copy()
+    when = match_dates(df, dates)
+    df["season"] = when.dt.year.astype("Int32")
+    df["date"] = when.dt.strftime("%Y-%m-%d")
+    return df
+
+
+def partition_dir(path: Path, season, date) -> Path:
+    season = "__HIVE_DEFAULT_PARTITION__" if pd.isna(season) else int(season)
+    date = "__HIVE_DEFAULT_PARTITION__" if pd.isna(date) else date
+    return path / f"season={season}" / f"date={date}"
+
+
+def write_partitions(df: pd.DataFrame, path: Path, key: str = None, dedup_keys: list = None,
+                     dates: dict = None):
+    """
+    Write df into its season/date partitions.
+
+    With dedup_keys, each touched partition is read back, merged keeping the
+    last row per key and rewritten as one file, so the cost of a batch depends
+    only on the days it covers. Without dedup_keys (raw backups) rows are added
+    as a new file in each partition.
+    """
+    df = partition_frame(df, dates)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    written = 0
+
+    for (season, date), part in df.groupby(PARTITION_COLS, dropna=False, sort=False):
+        out_dir = partition_dir(path, season, date)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        part = part.drop(columns=PARTITION_COLS)
+
+        if dedup_keys:
+            old_files = list(out_dir.glob("*.parquet"))
+            if old_files:
+                old = pd.concat([pq.read_table(f).to_pandas() for f in old_files], ignore_index=True)
+                part = pd.concat([old, part], ignore_index=True)
+            part = part.drop_duplicates(subset=dedup_keys, keep="last")
+            tmp = out_dir / f".part-{stamp}.tmp"
+            pq.write_table(typed_table(part, key), tmp)
+            for f in old_files:
+                f.unlink()
+            tmp.replace(out_dir / "part-0.parquet")
+        else:
+            pq.write_table(typed_table(part, key), out_dir / f"{stamp}.parquet")
+        written += len(part)
+
+    return written
 
-    combined = combined.drop_duplicates(subset=dedup_keys, keep="last")
-    combined.to_csv(master_path, index=False)
-    print(f"  [MASTER] {master_path.name} → {len(combined)} total rows")
+
+def append_to_master(df: pd.DataFrame, key: str, dates: dict = None):
+    if df is None or df.empty:
+        return
+    if MASTER_STORE == "csv":
+        return append_to_master_csv(df, key)
+
+    import_csv_masters()
+    df = df.loc[:, ~df.columns.duplicated()]
+    write_partitions(df, MASTER_DATASETS[key], key=key, dedup_keys=DEDUP_KEYS[key], dates=dates)
+    print(f"  [MASTER] {MASTER_DATASETS[key].name} ← {len(df)} rows")
+
+
+def save_raw_parquet(df: pd.DataFrame, key: str, dates: dict = None):
+    if df is None or df.empty:
+        return
+    write_partitions(df, RAW_DATASETS[key], dates=dates)
+
+
+# The CSV masters written before the Parquet store existed are imported on the
+# first Parquet read or write. A marker next to each dataset records the size
+# and mtime of the CSV it was imported from, so the import runs again only if
+# the CSV changes (e.g. after a run with MLS_MASTER_STORE=csv).
+
+_csv_import_lock = threading.Lock()
+_csv_import_checked = False
+
+
+def csv_import_marker(key: str) -> Path:
+    return MASTER_DATASETS[key] / CSV_IMPORT_MARKER
+
+
+def csv_signature(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def import_csv_master(key: str, force: bool = False) -> int:
+    """
+    Copy the legacy master CSV for key into its Parquet dataset.
+
+    Rows whose dedup key is already in the dataset are skipped, so anything
+    written to Parquet since takes precedence over the CSV copy.
+    """
+    csv_path = MASTER_FILES[key]
+    marker = csv_import_marker(key)
+    if not csv_path.exists():
+        return 0
+    signature = csv_signature(csv_path)
+    if not force and marker.exists() and json.loads(marker.read_text()) == signature:
+        return 0
+
+    dedup_keys = DEDUP_KEYS[key]
+    df = pd.read_csv(csv_path, low_memory=False)
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df.drop_duplicates(subset=dedup_keys, keep="last")
+
+    present = load_dataset(MASTER_DATASETS[key], columns=dedup_keys)
+    if len(present):
+        df = df[~dedup_key_strings(df, dedup_keys).isin(set(dedup_key_strings(present, dedup_keys)))]
+    if len(df):
+        write_partitions(df, MASTER_DATASETS[key], key=key, dedup_keys=dedup_keys)
+
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.write_text(json.dumps(signature))
+    print(f"  [IMPORT] {csv_path.name} → {MASTER_DATASETS[key].name} (+{len(df)} rows)")
+    return len(df)
+
+
+def import_csv_masters(force: bool = False):
+    """Import every legacy CSV master once per process; match_data goes first so the others can look up their dates."""
+    global _csv_import_checked
+    with _csv_import_lock:
+        if _csv_import_checked and not force:
+            return
+        for key in sorted(MASTER_FILES, key=lambda k: k != "match_data"):
+            import_csv_master(key, force=force)
+        _csv_import_checked = True
+
+
+def migrate_csv_masters():
+    """
+    Import the CSV masters and write Parquet from here on. The import markers
+    make later runs resolve to Parquet too; the CSVs are left in place but no
+    longer updated.
+    """
+    global MASTER_STORE
+    import_csv_masters(force=True)
+    MASTER_STORE = "parquet"
+
+
+def master_store_status() -> str:
+    if MASTER_STORE == "csv" and not os.getenv("MLS_MASTER_STORE"):
+        return ("[MASTERS] writing the legacy CSV masters; run once with --migrate-masters "
+                "to import them into the Parquet store")
+    return f"[MASTERS] store: {MASTER_STORE}"
+
+
+def load_known_match_ids(check_db: bool = False) -> set:
+    """match_ids already in the match_data master and, optionally, the `matches` table."""
+    known = set(load_master("match_data", columns=["match_id"])["match_id"].dropna().astype(str))
+
+    if check_db:
+        try:
+            from sqlalchemy import text
+            from mls.database.engine import make_engine
+            with make_engine().connect() as conn:
+                known |= {str(r[0]) for r in conn.execute(text("SELECT match_id FROM matches"))}
+        except Exception as e:
+            print(f"[WARN] could not read match_ids from the database ({e}); using masters only")
+
+    return known
+
+
+def drop_known_links(links: list, known: set) -> list:
+    """Pre-flight filter: keep only links whose match_id is not already stored."""
+    keep = [link for link in links if make_match_id(link) not in known]
+    if len(keep) < len(links):
+        print(f"[PRE-FLIGHT] skipping {len(links) - len(keep)} already-scraped matches")
+    return keep
 
 
 def add_links_to_master(new_links: list):
@@ -346,21 +1027,15 @@ def add_links_to_master(new_links: list):
 # Team mapping helpers
 # ─────────────────────────────────────────────
 
-def _norm_team(s: str) -> str:
-    if pd.isna(s):
-        return ""
-    return str(s).lower().strip().replace(".", "").replace("\u2019", "'")
-
-
 def map_club(df: pd.DataFrame) -> pd.DataFrame:
-    team_map_norm = {_norm_team(k): v for k, v in TEAM_MAP.items()}
-    team_map_norm.update({_norm_team(k): v for k, v in TEAM_ALIASES.items()})
+    team_map_norm = {norm_team(k): v for k, v in TEAM_MAP.items()}
+    team_map_norm.update({norm_team(k): v for k, v in TEAM_ALIASES.items()})
     abbrs = set(team_map_norm.values())
 
     if "club" not in df.columns:
         raise ValueError("No club column found.")
 
-    df["_club_norm"] = df["club"].apply(_norm_team)
+    df["_club_norm"] = normalize_series(df["club"], norm_team)
     df["club"] = df["_club_norm"].apply(
         lambda x: x.upper() if x.upper() in abbrs else team_map_norm.get(x)
     )
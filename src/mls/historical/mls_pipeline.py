@@ -5,20 +5,33 @@ Modes:
     --historical   Scrape all matches from a URL list CSV
     --weekly       Scrape last week's matches (default)
     --backfill     Discover and add missing URLs since a given date
+    --replay       Re-run the parsers over cached page snapshots (offline)
 
 Usage:
     python pipeline.py --historical --url-list data/raw/match_urls.csv --batch-size 50
+    python pipeline.py --historical --batch-size 200 --workers 4
     python pipeline.py --weekly
     python pipeline.py --backfill --stop-date 2026-02-21
+    python pipeline.py --replay --workers 8
+    python pipeline.py --weekly --migrate-masters   # move the CSV masters into the Parquet store
+
+Masters: an install with CSV masters keeps writing them until --migrate-masters
+imports them into data/raw/matches/parquet; from then on (and on fresh installs)
+the Parquet store is used. MLS_MASTER_STORE=csv|parquet overrides this.
 """
 
 import argparse
+import queue
 import random
+import threading
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 from helpers import *
+from mls.cleaning.matches.clean_match_feed import clean_match_feed
+from mls.cleaning.matches.clean_match_team import reframe_stats
 import pandas as pd
 from bs4 import BeautifulSoup
 from selenium.common.exceptions import ElementClickInterceptedException, StaleElementReferenceException, TimeoutException
@@ -31,30 +44,26 @@ from selenium.webdriver.support.ui import WebDriverWait
 MAX_ROUNDS       = 3
 COOLDOWN_SECONDS = 30
 
+SCHEDULE_URL     = "https://www.mlssoccer.com/schedule/scores#competition=MLS-COM-000001&club=all"
+
+# parallel scraping: drivers per pool and minimum gap between page loads across ALL workers
+N_WORKERS            = 4
+MIN_REQUEST_INTERVAL = 3.0
+
 
 # ─────────────────────────────────────────────
 # Extractors — TODO: fill in
 # ─────────────────────────────────────────────
 
-def extract_team_stats(driver, match_id):
-    
+def extract_match_header(driver, match_id):
     wait = WebDriverWait(driver, 10)
-    
-    ### wait for main body to load to ensure page is ready before scraping
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        
-    general_stats = []
-    shooting_stats = []
-    passing_stats = [] 
-    possession_stats = []
-    xg_stats = []
+
     date = ''
     home_team = ''
     away_team = ''
     home_score = None
     away_score = None
-    
-    main_body = driver.find_element(By.TAG_NAME, 'main')
+
     try:
         
         ### extract match header info (teams, score, date) for context in team stats dataset and to link with other datasets using match_id
@@ -80,6 +89,27 @@ def extract_team_stats(driver, match_id):
     except Exception as e:
         print(f"[ERR] extract_team failed for match {match_id}: {type(e).__name__}: {e}")
         traceback.print_exc()
+
+    return date, home_team, away_team, home_score, away_score
+
+
+def extract_team_stats(driver, match_id, link):
+    
+    wait = WebDriverWait(driver, 10)
+    
+    ### wait for main body to load to ensure page is ready before scraping
+    wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        
+    general_stats = []
+    shooting_stats = []
+    passing_stats = [] 
+    possession_stats = []
+    xg_stats = []
+    
+    main_body = driver.find_element(By.TAG_NAME, 'main')
+
+    date, home_team, away_team, home_score, away_score = extract_match_header(driver, match_id)
+
     try:
         try:
             ### navigate to stats tab for the match to access team stats data
@@ -90,6 +120,7 @@ def extract_team_stats(driver, match_id):
             stats_bttn.click()
             
             ### wait for stats content to load before attempting to scrape data            
+            wait_for_stats_module(driver)
             general_cont = wait.until(
                 EC.presence_of_element_located((
                     By.XPATH,
@@ -223,6 +254,10 @@ def extract_team_stats(driver, match_id):
         except Exception as e:
             print(f"Error occurred while scraping expected goals stats: {e}")
 
+        # archive the rendered stats tab so --replay can re-run the card parsers offline
+        if general_stats:
+            default_cache().put(link, driver.page_source, variant="stats")
+
     except Exception as e:
         print(f"Error occurred while scraping stats: {e}")
         pass
@@ -254,62 +289,48 @@ def extract_team_stats(driver, match_id):
     return all_stats, date, home_team, away_team, home_score, away_score
 
 
-def extract_feed(driver, match_id, date):
-    wait = WebDriverWait(driver, 10)
-    rows = []
+def load_feed_html(driver, wait):
+    # Make sure header exists (page loaded)
+    title_head = wait.until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "section.mls-l-module--match-hub-header-container"))
+    )
 
-    try:
-        time.sleep(2)
-        # Make sure header exists (page loaded)
-        title_head = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "section.mls-l-module--match-hub-header-container"))
-        )
-        
-        js_scroll_into_view(driver, title_head)
+    js_scroll_into_view(driver, title_head)
+
+    # Click Feed tab (safe click)
+    feed_button = wait.until(
+        EC.element_to_be_clickable((By.XPATH, "//a[contains(@href,'feed')] | //button[normalize-space(.)='Feed']"))
+    )
+    driver.execute_script("arguments[0].click();", feed_button)
+
+    # Wait until feed container exists before scrolling/loading
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed")))
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed__container")))
 
-        # Click Feed tab (safe click)
-        feed_button = wait.until(
-    		EC.element_to_be_clickable((By.XPATH, "//a[contains(@href,'feed')] | //button[normalize-space(.)='Feed']"))
-		)
-        driver.execute_script("arguments[0].click();", feed_button)
+    # Now load everything (lazy load)
+    load_full_feed_by_height(driver, step_px=1500, delay=0.6, max_rounds=80, stable_rounds_required=3)
 
-        # Wait until feed container exists before scrolling/loading
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed")))
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed__container")))
+    # Re-grab HTML after loading is complete
+    return driver.page_source
 
-        # Now load everything (lazy load)
-        load_full_feed_by_height(driver, step_px=1500, delay=0.6, max_rounds=80, stable_rounds_required=3)
 
-        # Re-grab HTML after loading is complete
-        html = driver.page_source
+def extract_feed(driver, match_id, date, link):
+    wait = WebDriverWait(driver, 10)
+    rows = []
+    cache = default_cache()
+
+    try:
+        # reuse a fully loaded capture of this feed if one is cached
+        cached = cache.get(link, variant="feed")
+        html = cached if cached is not None else load_feed_html(driver, wait)
 
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(html, "lxml")
-        cont = soup.select_one("div.mls-o-match-feed")
-        if not cont:
+        rows = parse_feed_from_html(html, match_id, date)
+        if rows is None:
             print(f"[WARN] feed container not found in HTML for match {match_id}")
-            return pd.DataFrame(columns=["match_id","date","minute","title","comment","out_player","in_player"])
-        
-        # extract events from feed container
-        events = cont.select("div.mls-o-match-feed__container")
-
-        for ev in events:
-            minute = get_html_text(ev.select_one(".mls-o-match-feed__regular-time")) or \
-                     get_html_text(ev.select_one(".mls-o-match-feed__minute"))
-            title = get_html_text(ev.select_one(".mls-o-match-feed__title"))
-            comment = get_html_text(ev.select_one(".mls-o-match-feed__comment"))
-            out_player = get_html_text(ev.select_one(".mls-o-match-feed__sub-out .mls-o-match-feed__player"))
-            in_player  = get_html_text(ev.select_one(".mls-o-match-feed__sub-in  .mls-o-match-feed__player"))
-
-            rows.append({
-                "match_id": match_id,
-                "date": date,
-                "minute": minute,
-                "title": title,
-                "comment": comment,
-                "out_player": out_player,
-                "in_player": in_player,
-            })
+            return pd.DataFrame(columns=FEED_COLUMNS)
+
+        if cached is None and rows:
+            cache.put(link, html, variant="feed")
 
     except Exception as e:
         print(f"[ERR] extract_feed failed for match {match_id}: {type(e).__name__}: {e}")
@@ -362,33 +383,6 @@ def parse_stat_table(table) -> list:
 # Cleaners — TODO: fill in (except outfield + gk)
 # ─────────────────────────────────────────────
 
-def reframe_stats(df):
-    match_id = df['match_id'].iloc[0]
-    out = {}
-
-    for _, row in df.iterrows():
-        stat = row.get("stat")
-        if pd.isna(stat):
-            continue
-        stat = str(stat).strip().lower()
-        if stat in ("", "nan", "none") or "nan" in stat:
-            continue
-
-        out[f"{stat}_home"] = row.get("home_value")
-        out[f"{stat}_away"] = row.get("away_value")
-
-    wide = pd.DataFrame([out]) if out else pd.DataFrame([{}])
-
-    wide.columns = [
-        re.sub(r"\s+", "_",
-        c.replace('%', 'pct').replace('-', '_')).lower()
-        for c in wide.columns
-    ]
-    wide["match_id"] = match_id
-    return wide
-
-
-
 def clean_match_team(df):
     df = df.copy()
     bar_dict = {
@@ -447,43 +441,6 @@ def clean_match_team(df):
 
 
 
-def clean_match_feed(df):
-    df = df.copy()
-    
-    df['title'] = df.apply(lambda x: 'Corner' if pd.notna(x['comment']) and 'corner' in x['comment'].lower() else x['title'], axis=1)
-
-    df['title'] = df.apply(lambda x: 'Foul' if pd.notna(x['comment']) and 'foul' in x['comment'].lower() else x['title'], axis=1)
-
-    df['title'] = df.apply(lambda x: 'Offside' if pd.notna(x['comment']) and 'offside' in x['comment'].lower() else x['title'], axis=1)   
-    
-    df = df[~df['comment'].str.contains('Lineups', na=False)]
-
-    df = df[~df['title'].str.contains('KICK OFF|HALF TIME|FULL TIME|END OF SECOND HALF', na=False)]
-    
-    df = df[df['minute'].notna()]
-    
-    df = df.iloc[::-1].reset_index(drop=True)
-    
-    df['title'] = df['title'].fillna('Substitution')
-
-    df['comment'] = df.apply(lambda x: f"Substitution: {x['out_player']} out, {x['in_player']} in" if x['title'] == 'Substitution' else x['comment'], axis=1)
-    
-    df['feed_id'] = df.groupby('match_id').cumcount() + 1
-        
-    df = df.sort_values(by=['date', 'match_id', 'feed_id'], ascending=[False, True, False]).reset_index(drop=False)
-    
-    df = df.drop(columns=['in_player', 'out_player'])
-
-    df = df[['match_id', 'date', 'feed_id', 'minute', 'title', 'comment']]
-    
-    df.rename(columns={'minute' : 'event_minute', 'title': 'event_type', 'comment' : 'event_comment', 'feed_id' : 'event_id'}, inplace=True)
-    
-    df = df[['event_id','match_id', 'event_minute', 'event_type', 'event_comment']]
-    
-    return df
-
-
-
 team_fullnames_to_short = {
     "Columbus": "CLB",
     "Orlando": "ORL",
@@ -582,11 +539,173 @@ def parse_player_stats_from_html(html: str, match_id: str = None):
     return pd.DataFrame(outfield_rows), pd.DataFrame(gk_rows)
 
 
+def parse_feed_from_html(html, match_id, date):
+    """Feed rows from a page snapshot, or None when the feed container is not in the HTML."""
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "lxml")
+    cont = soup.select_one("div.mls-o-match-feed")
+    if not cont:
+        return None
+
+    rows = []
+    for ev in cont.select("div.mls-o-match-feed__container"):
+        minute = get_html_text(ev.select_one(".mls-o-match-feed__regular-time")) or \
+                 get_html_text(ev.select_one(".mls-o-match-feed__minute"))
+        title = get_html_text(ev.select_one(".mls-o-match-feed__title"))
+        comment = get_html_text(ev.select_one(".mls-o-match-feed__comment"))
+        out_player = get_html_text(ev.select_one(".mls-o-match-feed__sub-out .mls-o-match-feed__player"))
+        in_player  = get_html_text(ev.select_one(".mls-o-match-feed__sub-in  .mls-o-match-feed__player"))
+
+        rows.append({
+            "match_id": match_id,
+            "date": date,
+            "minute": minute,
+            "title": title,
+            "comment": comment,
+            "out_player": out_player,
+            "in_player": in_player,
+        })
+    return rows
+
+
+def parse_match_header_from_html(html, season_year: int = 2025):
+    """(date, home_team, away_team, home_score, away_score), or None if the header is not rendered."""
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "lxml")
+    hub = soup.select_one(MATCH_HEADER_CSS)
+    if hub is None:
+        return None
+
+    home = hub.select_one(".mls-c-club.--home .mls-c-club__shortname")
+    away = hub.select_one(".mls-c-club.--away .mls-c-club__shortname")
+    subtitle = soup.select_one("div.mls-c-blockheader__subtitle")
+    if not (home and away and subtitle):
+        return None
+
+    scores = [sc.get_text(strip=True) for sc in hub.select(".mls-c-scorebug__score")]
+    date = clean_mls_date(subtitle.get_text("\n", strip=True), season_year)
+    return (date, home.get_text(strip=True), away.get_text(strip=True),
+            scores[0] if len(scores) > 0 else None, scores[1] if len(scores) > 1 else None)
+
+
+def parse_cards(group) -> list:
+    # BeautifulSoup twin of scrape_cards
+    if group is None:
+        return []
+    return [{
+        "stat":   get_html_text(c.select_one(".mls-o-stat-chart__header")) or "",
+        "first":  get_html_text(c.select_one(".mls-o-stat-chart__first-value")) or "",
+        "second": get_html_text(c.select_one(".mls-o-stat-chart__second-value")) or "",
+    } for c in group.select(".mls-o-stat-chart")]
+
+
+def parse_team_stats_from_html(html, match_id, date, home_team, away_team):
+    """Team stats in the extract_team_stats long format, or None if the stats modules are not rendered."""
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "lxml")
+    general = soup.select_one("section.mls-l-module--stats-comparison.mls-l-module--general")
+    if general is None or not parse_cards(general):
+        return None
+
+    clubs = soup.select_one('section.d3-l-section-row[data-toggle="clubs"]') or soup
+    xg_mod = clubs.select_one("section.mls-l-module--expected-goals")
+    groups = {
+        "general":  general,
+        "shooting": clubs.select_one("section.mls-l-module--shooting-breakdown"),
+        "passing":  soup.select_one("section[class*='passing-breakdown']"),
+        "xg":       xg_mod.select_one(".mls-o-expected-goals__chart-group") if xg_mod else None,
+    }
+
+    rows = []
+    for category, group in groups.items():
+        rows += [{"stat_name": it["stat"], "home_value": it["first"], "away_value": it["second"],
+                  "category": category} for it in parse_cards(group)]
+
+    for bar in soup.select("section[class*='--possession'] div.mls-o-possession__average-intervals"):
+        tip_id = bar.get("data-for")
+        tip = soup.find(id=tip_id) if tip_id else None
+        texts = [t.get_text(strip=True) for t in tip.select("span")] if tip else []
+        texts = [t for t in texts if t and t.upper() != "SKIP TO MAIN CONTENT"]
+        home_poss, home_adv, away_poss, away_adv = texts[:4] if len(texts) >= 4 else (None,) * 4
+        rows.append({"tip_id": tip_id, "home_possession": home_poss, "home_advantage": home_adv,
+                     "away_possession": away_poss, "away_advantage": away_adv, "category": "possession"})
+
+    df = pd.DataFrame(rows)
+    df["match_id"] = match_id
+    df["date"] = date
+    df["home_team"] = home_team
+    df["away_team"] = away_team
+    return df.reindex(columns=TEAM_STATS_COLUMNS)
+
+
+# ─────────────────────────────────────────────
+# HTTP fetch — static HTML first, Selenium only when sections are missing
+# ─────────────────────────────────────────────
+
+HTTP_TIMEOUT = 20
+
+
+def scrape_match_http(session, link: str, match_id: str):
+    """Frames for one match from the server-rendered HTML, or None if any section needs a browser."""
+    cache = default_cache()
+    html = cache.get(link, variant="http")
+    fresh = html is None
+    if fresh:
+        try:
+            resp = http_get(session, link, timeout=HTTP_TIMEOUT)
+            resp.raise_for_status()
+        except Exception as e:
+            print(f"  [HTTP] {match_id} fetch failed ({e}); using browser")
+            return None
+        html = resp.text
+
+    soup = BeautifulSoup(html, "lxml")
+
+    header = parse_match_header_from_html(soup)
+    if header is None:
+        return None
+    date, home_team, away_team, home_score, away_score = header
+
+    team_stats = parse_team_stats_from_html(soup, match_id, date, home_team, away_team)
+    df_outfield, df_gk = parse_player_stats_from_html(html, match_id)
+    feed_rows = parse_feed_from_html(soup, match_id, date)
+    if team_stats is None or df_outfield.empty or not feed_rows:
+        return None
+
+    feed = pd.DataFrame(feed_rows)
+    feed["home_team"] = home_team
+    feed["away_team"] = away_team
+
+    frames = {
+        "team_stats": team_stats,
+        "match_data": pd.DataFrame([{
+            "match_id":        match_id,
+            "date":            date,
+            "home_team":       home_team,
+            "away_team":       away_team,
+            "home_team_score": home_score,
+            "away_team_score": away_score,
+        }]),
+        "outfield": df_outfield,
+        "gk":       df_gk,
+        "feed":     feed,
+    }
+    # only a page that parsed completely is worth keeping; a blocked or partial
+    # one would otherwise be served from the cache and force the browser forever
+    if fresh:
+        cache.put(link, html, variant="http")
+    return {k: v for k, v in frames.items() if v is not None and not v.empty}
+
+
 # ─────────────────────────────────────────────
 # Player extraction
 # ─────────────────────────────────────────────
 
-def extract_players(driver, match_id: str, date):
+def extract_players(driver, match_id: str, date, link: str):
+    # reuse an earlier capture of this match's player tables if one is cached
+    cached = default_cache().get(link, variant="players")
+    if cached is not None:
+        df_outfield, df_gk = parse_player_stats_from_html(cached, match_id)
+        if not df_outfield.empty:
+            return df_outfield, df_gk
+
     wait = WebDriverWait(driver, 10)
 
     js_scroll_into_view(driver, driver.find_element(
@@ -627,7 +746,10 @@ def extract_players(driver, match_id: str, date):
     js_scroll_by(driver, 1500)
 
     html = driver.page_source
-    return parse_player_stats_from_html(html, match_id)
+    df_outfield, df_gk = parse_player_stats_from_html(html, match_id)
+    if not df_outfield.empty:
+        default_cache().put(link, html, variant="players")
+    return df_outfield, df_gk
 
 
 # ─────────────────────────────────────────────
@@ -785,17 +907,17 @@ def clean_all(raw: dict) -> dict:
 
 def extract_match_links(driver) -> list:
     wait = WebDriverWait(driver, 10)
-    driver.get("https://www.mlssoccer.com/schedule/scores#competition=MLS-COM-000001&club=all")
-    wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "body")))
-    time.sleep(2)
+    driver.get(SCHEDULE_URL)
+    wait_for_schedule(driver)
 
     all_links = set()
     try:
         previous_button = wait.until(EC.element_to_be_clickable(
             (By.XPATH, "//button[@aria-label='Previous results']")
         ))
+        current = schedule_hrefs(driver)
         previous_button.click()
-        time.sleep(3)
+        wait_for_schedule_update(driver, current)
 
         matches_table = wait.until(EC.presence_of_element_located(
             (By.CLASS_NAME, 'mls-c-schedule__matches')
@@ -812,10 +934,9 @@ def extract_match_links(driver) -> list:
 
 def scrape_missing_links(driver, stop_date="2026-02-21"):
     wait = WebDriverWait(driver, 10)
-    driver.get("https://www.mlssoccer.com/schedule/scores#competition=MLS-COM-000001&club=all")
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    time.sleep(2)
-    dismiss_cookies(driver)
+    driver.get(SCHEDULE_URL)
+    wait_for_schedule(driver)
+    ensure_consent(driver)
 
     all_links = set()
     stop = pd.to_datetime(stop_date)
@@ -855,8 +976,9 @@ def scrape_missing_links(driver, stop_date="2026-02-21"):
             prev_btn = wait.until(EC.element_to_be_clickable(
                 (By.XPATH, "//button[@aria-label='Previous results']")
             ))
+            current = schedule_hrefs(driver)
             prev_btn.click()
-            time.sleep(3)
+            wait_for_schedule_update(driver, current)
 
         except Exception as e:
             print(f"  [ERROR] Stopped early: {e}")
@@ -867,17 +989,91 @@ def scrape_missing_links(driver, stop_date="2026-02-21"):
     return list(all_links)
 
 
-def scrape_match_list(driver, links: list) -> dict:
-    wait = WebDriverWait(driver, 10)
-    combined = {k: pd.DataFrame() for k in PATHS.keys()}
+def scrape_match(driver, link: str, match_id: str, backend: str = "dom") -> dict:
+    frames = {}
+    capture = None
+
+    if backend == "api":
+        capture = network_capture(driver)
+        capture.reset()
+
+    driver.get(link)
+    wait_for_match_header(driver)
+    ensure_consent(driver)
+
+    if capture is not None:
+        date, home_team, away_team, home_score, away_score = extract_match_header(driver, match_id)
+        frames = extract_match_api(driver, capture, match_id, date, home_team, away_team)
+
+    if "team_stats" not in frames:
+        match_team_data, date, home_team, away_team, home_score, away_score = extract_team_stats(driver, match_id, link)
+        frames["team_stats"] = match_team_data
+
+    frames["match_data"] = pd.DataFrame([{
+        "match_id":        match_id,
+        "date":            date,
+        "home_team":       home_team,
+        "away_team":       away_team,
+        "home_team_score": home_score,
+        "away_team_score": away_score,
+    }])
+
+    # the API payload may map only one of the player tables; take each missing one from the DOM
+    missing = [k for k in ("outfield", "gk") if frames.get(k) is None or frames[k].empty]
+    if missing:
+        dom = dict(zip(("outfield", "gk"), extract_players(driver, match_id, date, link)))
+        for key in missing:
+            if dom[key] is not None and not dom[key].empty:
+                frames[key] = dom[key]
+
+    if "feed" not in frames:
+        feed_data = extract_feed(driver, match_id, date, link)
+        if feed_data is not None and not feed_data.empty:
+            frames["feed"] = feed_data
+    if "feed" in frames:
+        frames["feed"]["home_team"] = home_team
+        frames["feed"]["away_team"] = away_team
+
+    return {k: v for k, v in frames.items() if v is not None and not v.empty}
+
+
+def finish_sink(sink: FrameSink) -> dict:
+    """
+    sink.result() at the end of a scrape loop. If the last flush fails, the run
+    carries on: the unsaved rows go to a recovery backup (save_recovery) and
+    whatever the sink had already kept is returned.
+    """
+    try:
+        return sink.result()
+    except FlushError as e:
+        print(f"[FLUSH FAILED] {e}")
+        traceback.print_exc()
+        save_recovery(*sink.drain())
+        return sink.kept()
+
+
+def write_failures(failed: list):
+    if not failed:
+        return
+    failures_path = RAW_BASE / f"{datetime.today().strftime('%Y-%m-%d')}_failures.csv"
+    pd.DataFrame(failed).to_csv(failures_path, index=False)
+    print(f"\n[FAILURES] {len(failed)} failed matches → {failures_path}")
+
+
+def scrape_match_list(driver, links: list, backend: str = "dom", fetch: str = "browser",
+                      sink: FrameSink = None, journal: CheckpointJournal = None) -> dict:
+    sink = sink or FrameSink(PATHS.keys())
     failed = []
     remaining_links = list(links)
-    
-    driver.get('https://www.mlssoccer.com/schedule/scores#competition=MLS-COM-000001&club=all')
-    
-    time.sleep(2)
-    
-    dismiss_cookies(driver)
+
+    # in http mode Chrome is only started for the first match the static HTML can't cover
+    session = http_session() if fetch == "http" else None
+    own_driver = False
+
+    if driver is not None:
+        driver.get(SCHEDULE_URL)
+        wait_for_schedule(driver)
+        ensure_consent(driver)
 
     for round_num in range(1, MAX_ROUNDS + 1):
         print(f"\n=== Round {round_num}/{MAX_ROUNDS} | {len(remaining_links)} matches ===")
@@ -885,51 +1081,34 @@ def scrape_match_list(driver, links: list) -> dict:
 
         for link in remaining_links:
             match_id = make_match_id(link)
+            if journal is not None:
+                journal.started(link)
 
             try:
-                driver.get(link)
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                
-                time.sleep(2)
-                
-                dismiss_cookies(driver)
-                
-                time.sleep(2)
-                
-                dismiss_cookies(driver)
-                
-                time.sleep(2)
-
-                match_team_data, date, home_team, away_team, home_score, away_score = extract_team_stats(driver, match_id)
-                combined["team_stats"] = pd.concat([combined["team_stats"], match_team_data], ignore_index=True)
-
-                match_row = pd.DataFrame([{
-                    "match_id":        match_id,
-                    "date":            date,
-                    "home_team":       home_team,
-                    "away_team":       away_team,
-                    "home_team_score": home_score,
-                    "away_team_score": away_score,
-                }])
-                combined["match_data"] = pd.concat([combined["match_data"], match_row], ignore_index=True)
-
-                df_outfield, df_gk = extract_players(driver, match_id, date)
-                if df_outfield is not None and not df_outfield.empty:
-                    combined["outfield"] = pd.concat([combined["outfield"], df_outfield], ignore_index=True)
-                if df_gk is not None and not df_gk.empty:
-                    combined["gk"] = pd.concat([combined["gk"], df_gk], ignore_index=True)
-
-                feed_data = extract_feed(driver, match_id, date)
-                if feed_data is not None and not feed_data.empty:
-                    feed_data["home_team"] = home_team
-                    feed_data["away_team"] = away_team
-                    combined["feed"] = pd.concat([combined["feed"], feed_data], ignore_index=True)
-
+                frames = scrape_match_http(session, link, match_id) if session is not None else None
+                if frames is None:
+                    if driver is None:
+                        driver = set_up_driver(capture_network=(backend == "api"))
+                        consent_for(driver).seed()
+                        own_driver = True
+                    frames = scrape_match(driver, link, match_id, backend=backend)
+                else:
+                    print(f"  [HTTP] {match_id}")
+                if journal is not None:
+                    journal.scraped(link)
                 print(f"  [OK] {match_id}")
+                sink.add(frames, tag=link)
+
+            except FlushError as e:
+                # the match itself is fine; its rows stay in the sink for the next flush
+                print(f"  [FLUSH FAILED] {e}")
+                traceback.print_exc()
 
             except Exception as e:
                 print(f"  [FAILED] {match_id} | {link} | {e}")
                 traceback.print_exc()
+                if journal is not None:
+                    journal.failed(link, str(e))
                 failed.append({"round": round_num, "match_id": match_id, "url": link, "error": str(e)})
                 next_remaining.append(link)
                 continue
@@ -945,40 +1124,506 @@ def scrape_match_list(driver, links: list) -> dict:
             print(f"Cooling down {sleep_time:.1f}s before retry...")
             time.sleep(sleep_time)
 
-    if failed:
-        from helpers import RAW_BASE
-        failures_path = RAW_BASE / f"{datetime.today().strftime('%Y-%m-%d')}_failures.csv"
-        pd.DataFrame(failed).to_csv(failures_path, index=False)
-        print(f"\n[FAILURES] {len(failed)} failed matches → {failures_path}")
+    if own_driver:
+        driver.quit()
+
+    write_failures(failed)
+
+    return finish_sink(sink)
 
-    return combined
+
+# ─────────────────────────────────────────────
+# Parallel scraping
+# ─────────────────────────────────────────────
+
+class RateLimiter:
+    """Global polite rate limit: at most one page load every `min_interval` seconds across all workers."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def scrape_match_list_parallel(links: list, workers: int = N_WORKERS,
+                               min_interval: float = MIN_REQUEST_INTERVAL, backend: str = "dom",
+                               fetch: str = "browser", sink: FrameSink = None,
+                               journal: CheckpointJournal = None) -> dict:
+    sink = sink or FrameSink(PATHS.keys())
+    failed = []
+    lock = threading.Lock()
+    limiter = RateLimiter(min_interval)
+
+    link_queue = queue.Queue()
+    for link in links:
+        link_queue.put(link)
+
+    def next_from_queue():
+        while True:
+            try:
+                yield link_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def worker(worker_id: int):
+        tag = f"[W{worker_id}]"
+        session = http_session() if fetch == "http" else None
+        driver = None
+
+        def browser():
+            nonlocal driver
+            if driver is None:
+                driver = set_up_driver(log_path=f"chromedriver_{worker_id}.log",
+                                       capture_network=(backend == "api"))
+                consent_for(driver).seed()
+            return driver
+
+        try:
+            if session is None:
+                try:
+                    browser()
+                except Exception as e:
+                    print(f"  {tag} [DRIVER FAILED] {e}")
+                    return
+
+            # round 1 drains the shared queue; later rounds retry only this worker's failures
+            pending = next_from_queue()
+            for round_num in range(1, MAX_ROUNDS + 1):
+                retry = []
+
+                for link in pending:
+                    match_id = make_match_id(link)
+                    limiter.wait()
+                    if journal is not None:
+                        journal.started(link)
+                    try:
+                        frames = scrape_match_http(session, link, match_id) if session is not None else None
+                        if frames is None:
+                            frames = scrape_match(browser(), link, match_id, backend=backend)
+                        if journal is not None:
+                            journal.scraped(link)
+                        print(f"  {tag} [OK] {match_id}")
+                        sink.add(frames, tag=link)
+                    except FlushError as e:
+                        print(f"  {tag} [FLUSH FAILED] {e}")
+                        traceback.print_exc()
+                    except Exception as e:
+                        print(f"  {tag} [FAILED] {match_id} | {link} | {e}")
+                        traceback.print_exc()
+                        if journal is not None:
+                            journal.failed(link, str(e))
+                        with lock:
+                            failed.append({"round": round_num, "worker": worker_id,
+                                           "match_id": match_id, "url": link, "error": str(e)})
+                        retry.append(link)
+
+                if not retry:
+                    break
+
+                pending = retry
+                if round_num < MAX_ROUNDS:
+                    sleep_time = COOLDOWN_SECONDS + random.random() * 10
+                    print(f"  {tag} Cooling down {sleep_time:.1f}s before retrying {len(retry)} matches...")
+                    time.sleep(sleep_time)
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    workers = max(1, min(workers, len(links)))
+    print(f"\n=== Parallel scrape | {len(links)} matches | {workers} workers ===")
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(1, workers + 1)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # links never picked up (e.g. every driver failed to start) count as failures
+    for link in next_from_queue():
+        failed.append({"round": 0, "worker": None, "match_id": make_match_id(link),
+                       "url": link, "error": "not scraped"})
+
+    write_failures(failed)
+
+    return finish_sink(sink)
+
+
+# ─────────────────────────────────────────────
+# API extraction — map captured match-hub JSON onto the DOM frame schemas
+# ─────────────────────────────────────────────
+
+API_ROUTES = {
+    "team_stats": ("statistics/clubs", "club_stats", "clubs/matches"),
+    "players":    ("statistics/players", "player_stats", "players/matches"),
+    "feed":       ("commentary", "match_feed", "key_events"),
+}
+API_WAIT_SECONDS = 5
+
+TEAM_STATS_COLUMNS = ["category", "match_id", "date", "home_team", "away_team", "stat_name",
+                      "home_value", "away_value", "tip_id", "home_possession", "home_advantage",
+                      "away_possession", "away_advantage"]
+OUTFIELD_COLUMNS = ["player", "mins_played", "goals", "expected_goals", "total_scoring_att",
+                    "ontarget_scoring_att", "accurate_pass_per_match_hub", "goal_assist", "accurate_pass",
+                    "accurate_cross", "corner_taken", "total_att_assist", "aerial_duel", "aerial_duel_per",
+                    "fouls", "was_fouled", "total_offside", "yellow_card", "total_red_card"]
+GK_COLUMNS = ["player", "mins_played", "saves", "goals_conceded", "expected_goals_conceded",
+              "successful_passes", "accurate_pass_per_match_hub", "keeper_throws", "total_long_balls",
+              "total_launches", "goal_kicks", "fouls", "was_fouled", "yellow_card", "total_red_card",
+              "lost_corners", "punches"]
+FEED_COLUMNS = ["match_id", "date", "minute", "title", "comment", "out_player", "in_player"]
+
+# (category, DOM card label) → Opta stat keys, first present wins; "opp:" reads the other club
+CLUB_STAT_KEYS = [
+    ("general",  "Possession %",       ("possession_percentage",)),
+    ("general",  "Shots",              ("total_scoring_att",)),
+    ("general",  "Shots on Target",    ("ontarget_scoring_att",)),
+    ("general",  "Blocked Shots",      ("blocked_scoring_att",)),
+    ("general",  "Total Passes",       ("total_pass",)),
+    ("general",  "Passing Accuracy %", ("accurate_pass_per", "pass_percentage")),
+    ("general",  "Corners",            ("won_corners", "corner_taken")),
+    ("general",  "Total Crosses",      ("total_cross",)),
+    ("general",  "Offsides",           ("total_offside",)),
+    ("general",  "Aerial Duels Won",   ("aerial_won",)),
+    ("general",  "Expected Goals",     ("expected_goals",)),
+    ("general",  "Goalkeeper Saves",   ("saves",)),
+    ("general",  "Clearances",         ("total_clearance",)),
+    ("general",  "Fouls",              ("fk_foul_lost", "fouls")),
+    ("general",  "Yellow Cards",       ("total_yel_card", "yellow_card")),
+    ("general",  "Red Cards",          ("total_red_card", "red_card")),
+    ("general",  "Goals",              ("goals",)),
+    ("general",  "On Target",          ("ontarget_scoring_att",)),
+    ("general",  "Off Target",         ("shot_off_target",)),
+    ("general",  "Blocked",            ("blocked_scoring_att",)),
+    ("general",  "Goals Conceded",     ("goals_conceded", "opp:goals")),
+    ("general",  "Shots Against",      ("opp:total_scoring_att",)),
+    ("general",  "Clean Sheets",       ("clean_sheet",)),
+    ("general",  "XG Conceded",        ("expected_goals_conceded", "opp:expected_goals")),
+    ("general",  "Interceptions",      ("interception", "interceptions")),
+    ("shooting", "Goals",              ("goals",)),
+    ("shooting", "On Target",          ("ontarget_scoring_att",)),
+    ("shooting", "Off Target",         ("shot_off_target",)),
+    ("shooting", "Blocked",            ("blocked_scoring_att",)),
+    ("xg",       "Total Team XG",      ("expected_goals",)),
+    ("xg",       "Shots",              ("total_scoring_att",)),
+    ("xg",       "Shots On Target",    ("ontarget_scoring_att",)),
+]
+
+
+def _pick(d: dict, *keys):
+    for k in keys:
+        if isinstance(d, dict) and d.get(k) is not None:
+            return d[k]
+    return None
+
+
+def _flatten_stats(record: dict) -> dict:
+    # stats come either as {"key": value} or as [{"name"/"type": key, "value": value}, ...]
+    stats = _pick(record, "statistics", "stats") or {}
+    if isinstance(stats, list):
+        stats = {_pick(x, "name", "type", "stat"): _pick(x, "value") for x in stats if isinstance(x, dict)}
+    flat = {k: v for k, v in record.items() if not isinstance(v, (dict, list))}
+    flat.update(stats)
+    return flat
+
+
+def _is_home(record: dict, idx: int) -> bool:
+    side = _pick(record, "side", "team_side", "home_away")
+    if isinstance(side, str):
+        return side.lower().startswith("home")
+    flag = _pick(record, "is_home", "home")
+    return bool(flag) if flag is not None else idx == 0
+
+
+def _split_sides(payload) -> tuple:
+    if isinstance(payload, dict) and "home" in payload and "away" in payload:
+        return _flatten_stats(payload["home"]), _flatten_stats(payload["away"])
+    records = payload if isinstance(payload, list) else _pick(payload, "clubs", "teams", "data") or []
+    records = [r for r in records if isinstance(r, dict)]
+    if len(records) != 2:
+        raise ValueError(f"expected two club records, got {len(records)}")
+    home = next(r for i, r in enumerate(records) if _is_home(r, i))
+    away = next(r for r in records if r is not home)
+    return _flatten_stats(home), _flatten_stats(away)
+
+
+def _club_value(own: dict, opp: dict, keys: tuple):
+    for k in keys:
+        src, k = (opp, k[4:]) if k.startswith("opp:") else (own, k)
+        if src.get(k) is not None:
+            return src[k]
+    if "accurate_pass_per" in keys and own.get("total_pass"):
+        return round(100 * float(own.get("accurate_pass") or 0) / float(own["total_pass"]), 1)
+    return None
+
+
+def map_team_stats_payload(payload, match_id, date, home_team, away_team) -> pd.DataFrame:
+    home, away = _split_sides(payload)
+    rows = [{
+        "category":   category,
+        "stat_name":  label,
+        "home_value": _club_value(home, away, keys),
+        "away_value": _club_value(away, home, keys),
+    } for category, label, keys in CLUB_STAT_KEYS]
+
+    df = pd.DataFrame(rows)
+    if df[["home_value", "away_value"]].isna().all().all():
+        raise ValueError("no known club stat keys in payload")
+    df["match_id"] = match_id
+    df["date"] = date
+    df["home_team"] = home_team
+    df["away_team"] = away_team
+    return df.reindex(columns=TEAM_STATS_COLUMNS)
+
+
+def map_players_payload(payload, match_id) -> tuple:
+    records = payload if isinstance(payload, list) else _pick(payload, "players", "data") or []
+    outfield_rows, gk_rows = [], []
+
+    for rec in records:
+        if not isinstance(rec, dict):
+            continue
+        flat = _flatten_stats(rec)
+        name = _pick(flat, "short_name", "known_name", "player_name", "name") or \
+               " ".join(x for x in (_pick(flat, "first_name"), _pick(flat, "last_name")) if x)
+        if not name:
+            continue
+        if flat.get("accurate_pass_per_match_hub") is None and flat.get("total_pass"):
+            flat["accurate_pass_per_match_hub"] = round(
+                100 * float(flat.get("accurate_pass") or 0) / float(flat["total_pass"]), 1)
+
+        row = {**flat, "player": name}
+        row["club"] = _pick(flat, "club_abbreviation", "team_abbreviation", "club", "team")
+        row["side"] = "home" if _is_home(flat, -1) else "away"
+        row["match_id"] = match_id
+
+        position = str(_pick(flat, "position", "position_type") or "").lower()
+        is_gk = position in ("gk", "goalkeeper") or flat.get("saves") is not None
+        (gk_rows if is_gk else outfield_rows).append(row)
+
+    if not outfield_rows:
+        raise ValueError("no player records in payload")
+
+    meta = ["club", "side", "match_id"]
+    return (pd.DataFrame(outfield_rows).reindex(columns=OUTFIELD_COLUMNS + meta),
+            pd.DataFrame(gk_rows).reindex(columns=GK_COLUMNS + meta))
+
+
+def map_feed_payload(payload, match_id, date) -> pd.DataFrame:
+    records = payload if isinstance(payload, list) else _pick(payload, "commentary", "events", "data") or []
+    rows = []
+    for ev in records:
+        if not isinstance(ev, dict):
+            continue
+        minute = _pick(ev, "minute", "time", "match_minute")
+        title = _pick(ev, "title", "type", "event_type")
+        rows.append({
+            "match_id":   match_id,
+            "date":       date,
+            "minute":     f"{minute}'" if isinstance(minute, (int, float)) else minute,
+            "title":      str(title).replace("_", " ").title() if title else None,
+            "comment":    _pick(ev, "comment", "text", "description"),
+            "out_player": _pick(ev, "player_off", "out_player", "playerOff"),
+            "in_player":  _pick(ev, "player_on", "in_player", "playerOn"),
+        })
+    if not rows:
+        raise ValueError("no feed events in payload")
+    return pd.DataFrame(rows, columns=FEED_COLUMNS)
+
+
+def classify_payload(url: str):
+    for key, tokens in API_ROUTES.items():
+        if any(t in url for t in tokens):
+            return key
+    return None
+
+
+def extract_match_api(driver, capture, match_id, date, home_team, away_team) -> dict:
+    """Sections that could not be mapped are left out, so the caller can fall back to the DOM."""
+    def _all_seen(_):
+        return {classify_payload(u) for u, _p in capture.poll()} >= set(API_ROUTES)
+    wait_for(driver, _all_seen, timeout=API_WAIT_SECONDS)
+
+    frames = {}
+    mapped = set()
+    for url, payload in capture.payloads:
+        key = classify_payload(url)
+        if key is None or key in mapped:
+            continue
+        try:
+            if key == "team_stats":
+                frames["team_stats"] = map_team_stats_payload(payload, match_id, date, home_team, away_team)
+            elif key == "players":
+                frames["outfield"], frames["gk"] = map_players_payload(payload, match_id)
+            elif key == "feed":
+                frames["feed"] = map_feed_payload(payload, match_id, date)
+            mapped.add(key)
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"  [API] {key} payload not usable for {match_id} ({e}); falling back to DOM")
+    return frames
 
 
 # ─────────────────────────────────────────────
 # Save + upload
 # ─────────────────────────────────────────────
 
+def batch_match_dates(frames: dict) -> dict:
+    """match_id → date from a batch's match_data, used to partition frames that carry no date."""
+    md = frames.get("match_data")
+    if md is None or md.empty or "date" not in md.columns:
+        return {}
+    return dict(zip(md["match_id"].astype(str), md["date"]))
+
+
 def save_raw_backups(raw: dict):
     print("\n--- Saving raw backups ---")
+    dates = batch_match_dates(raw)
     for key, df in raw.items():
-        write_csv(df, dated_filename(key))
+        append_csv(df, dated_filename(key))
+        save_raw_parquet(df, key, dates=dates)
 
 
 def save_masters(cleaned: dict):
-    print("\n--- Updating master CSVs ---")
+    print("\n--- Updating masters ---")
+    dates = batch_match_dates(cleaned)
     for key, df in cleaned.items():
-        append_to_master(df, key)
+        append_to_master(df, key, dates=dates)
+
+
+def persist_chunk(raw: dict):
+    """FrameSink flush target: back up, clean and merge one chunk of scraped matches."""
+    save_raw_backups(raw)
+    print("\n--- Cleaning ---")
+    save_masters(clean_all(raw))
 
 
 
+# ─────────────────────────────────────────────
+# Replay — re-parse archived snapshots, no network
+# ─────────────────────────────────────────────
+
+# snapshot variants written by the scrapers, in the order they are tried per section
+REPLAY_VARIANTS = ("http", "stats", "players", "feed")
+
+
+def replay_match(url: str) -> dict:
+    """Rebuild one match's raw frames from its cached page snapshots."""
+    cache = default_cache()
+    snaps = {v: cache.get(url, variant=v) for v in REPLAY_VARIANTS}
+    snaps = {v: BeautifulSoup(html, "lxml") for v, html in snaps.items() if html is not None}
+    match_id = make_match_id(url)
+
+    header = next((h for h in (parse_match_header_from_html(soup) for soup in snaps.values()) if h), None)
+    if header is None:
+        raise ValueError(f"no snapshot with a match header for {url}")
+    date, home_team, away_team, home_score, away_score = header
+
+    frames = {
+        "match_data": pd.DataFrame([{
+            "match_id":        match_id,
+            "date":            date,
+            "home_team":       home_team,
+            "away_team":       away_team,
+            "home_team_score": home_score,
+            "away_team_score": away_score,
+        }]),
+    }
+
+    for v in ("stats", "http"):
+        if v in snaps:
+            team_stats = parse_team_stats_from_html(snaps[v], match_id, date, home_team, away_team)
+            if team_stats is not None:
+                frames["team_stats"] = team_stats
+                break
+
+    for v in ("players", "http"):
+        if v in snaps:
+            df_outfield, df_gk = parse_player_stats_from_html(str(snaps[v]), match_id)
+            if not df_outfield.empty:
+                frames["outfield"], frames["gk"] = df_outfield, df_gk
+                break
+
+    for v in ("feed", "http"):
+        if v in snaps:
+            rows = parse_feed_from_html(snaps[v], match_id, date)
+            if rows:
+                feed = pd.DataFrame(rows)
+                feed["home_team"] = home_team
+                feed["away_team"] = away_team
+                frames["feed"] = feed
+                break
+
+    return {k: v for k, v in frames.items() if v is not None and not v.empty}
+
+
+def replay_match_list(links: list, workers: int = None, sink: FrameSink = None) -> dict:
+    sink = sink or FrameSink(PATHS.keys())
+    failed = []
+
+    # parsing is CPU-bound, so fan out over processes rather than threads
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(replay_match, link): link for link in links}
+        for fut in as_completed(futures):
+            link = futures[fut]
+            match_id = make_match_id(link)
+            try:
+                frames = fut.result()
+                print(f"  [OK] {match_id}")
+                sink.add(frames)
+            except FlushError as e:
+                print(f"  [FLUSH FAILED] {e}")
+            except Exception as e:
+                print(f"  [FAILED] {match_id} | {link} | {e}")
+                failed.append({"round": 1, "match_id": match_id, "url": link, "error": str(e)})
+
+    write_failures(failed)
+    return finish_sink(sink)
+
+
+def replay_links(url_list: str = None) -> list:
+    """Every match URL with at least one archived snapshot, optionally limited to a URL list CSV."""
+    cached = {url for url, variant, _ in default_cache().entries() if variant in REPLAY_VARIANTS}
+    if url_list:
+        wanted = set(pd.read_csv(url_list)["url"].dropna())
+        cached &= {canonical_url(u) for u in wanted}
+    return sorted(cached)
+
+
 # ─────────────────────────────────────────────
 # Main run
 # ─────────────────────────────────────────────
 
-def run(mode: str, url_list: str = None, batch_size: int = 50, stop_date: str = "2026-02-21"):
+def run(mode: str, url_list: str = None, batch_size: int = 50, stop_date: str = "2026-02-21",
+        workers: int = 1, backend: str = "dom", fetch: str = "browser", flush_every: int = FLUSH_EVERY,
+        force: bool = False, check_db: bool = False, migrate_masters: bool = False):
     ensure_dirs()
-    driver = set_up_driver()
-    dismiss_cookies(driver)
+    if migrate_masters:
+        migrate_csv_masters()
+    print(master_store_status())
+
+    if mode == "replay":
+        all_links = replay_links(url_list)
+        print(f"[REPLAY] {len(all_links)} archived matches")
+        sink = FrameSink(PATHS.keys(), on_flush=lambda raw: save_masters(clean_all(raw)),
+                         flush_every=flush_every)
+        replay_match_list(all_links, workers=workers if workers > 1 else None, sink=sink)
+        compact_masters()
+        print("\n[DONE] Replay complete.")
+        return
+
+    # historical http runs only start Chrome if a page needs the fallback
+    driver = None
+    if mode != "historical" or fetch != "http":
+        driver = set_up_driver(capture_network=(backend == "api"))
+        consent_for(driver).seed()
+    journal = None
 
     try:
         if mode == "backfill":
@@ -995,10 +1640,22 @@ def run(mode: str, url_list: str = None, batch_size: int = 50, stop_date: str =
                 raise ValueError(f"URL list must have a 'url' column. Found: {df_urls.columns.tolist()}")
             all_links = df_urls["url"].dropna().unique().tolist()
             print(f"[HISTORICAL] {len(all_links)} match URLs loaded from {path}")
+
+            # resume: skip links the journal has as done, retry earlier failures first
+            journal = CheckpointJournal()
+            if force:
+                journal.register(all_links)
+            else:
+                all_links = journal.resume_order(all_links)
+                print(f"[HISTORICAL] journal {journal.summary()} → {len(all_links)} to scrape")
         else:
             all_links = extract_match_links(driver)
             print(f"[WEEKLY] {len(all_links)} match URLs found")
 
+        # drop matches that are already stored before any browser work; --force re-scrapes them
+        if not force:
+            all_links = drop_known_links(all_links, load_known_match_ids(check_db=check_db))
+
         if not all_links:
             print("No match links found. Exiting.")
             return
@@ -1012,23 +1669,29 @@ def run(mode: str, url_list: str = None, batch_size: int = 50, stop_date: str =
                 print(f"BATCH {batch_num}/{len(batches)} | {len(batch)} matches")
                 print(f"{'='*50}")
 
-            print("\n--- Scraping ---")
-            raw = scrape_match_list(driver, batch)
-
-            save_raw_backups(raw)
+            # completed matches are saved every flush_every matches, not only at batch end
+            sink = FrameSink(PATHS.keys(), on_flush=persist_chunk, flush_every=flush_every,
+                             on_done=journal.done if journal is not None else None)
 
-            print("\n--- Cleaning ---")
-            cleaned = clean_all(raw)
-
-            save_masters(cleaned)
+            print("\n--- Scraping ---")
+            if workers > 1:
+                scrape_match_list_parallel(batch, workers=workers, backend=backend, fetch=fetch,
+                                           sink=sink, journal=journal)
+            else:
+                scrape_match_list(driver, batch, backend=backend, fetch=fetch, sink=sink, journal=journal)
 
             if len(batches) > 1 and batch_num < len(batches):
                 sleep_time = 60 + random.random() * 30
                 print(f"\nBatch cooldown {sleep_time:.1f}s...")
                 time.sleep(sleep_time)
 
+        compact_masters()
+        if journal is not None:
+            print(f"[HISTORICAL] journal {journal.summary()}")
+
     finally:
-        driver.quit()
+        if driver is not None:
+            driver.quit()
         print("\n[DONE] Pipeline complete.")
 
 
@@ -1041,14 +1704,33 @@ if __name__ == "__main__":
     parser.add_argument("--historical",  action="store_true", help="Scrape all matches from URL list")
     parser.add_argument("--weekly",      action="store_true", help="Scrape last week's matches")
     parser.add_argument("--backfill",    action="store_true", help="Discover missing URLs since stop-date")
+    parser.add_argument("--replay",      action="store_true", help="Re-parse archived page snapshots, no network")
     parser.add_argument("--url-list",    type=str, default=None,          help="Path to URL list CSV (historical mode)")
     parser.add_argument("--batch-size",  type=int, default=50,            help="Matches per batch (historical mode)")
     parser.add_argument("--stop-date",   type=str, default="2026-02-21",  help="Stop date for backfill (YYYY-MM-DD)")
+    parser.add_argument("--workers",     type=int, default=1,             help="Parallel browser workers (1 = single driver)")
+    parser.add_argument("--flush-every", type=int, default=FLUSH_EVERY,   help="Save raw + masters every N scraped matches")
+    parser.add_argument("--force",       action="store_true", help="Re-scrape matches already in the masters/journal")
+    parser.add_argument("--check-db",    action="store_true", help="Also skip match_ids already in the matches table")
+    parser.add_argument("--migrate-masters", action="store_true",
+                        help="Import the CSV masters into the Parquet store and use Parquet from now on "
+                             "(the CSVs stay but are no longer updated)")
+    parser.add_argument("--backend",     choices=["dom", "api"], default="dom",
+                        help="dom = click through tabs; api = read match-hub JSON, DOM fallback per section")
+    parser.add_argument("--fetch",       choices=["browser", "http"], default="browser",
+                        help="http = plain requests + lxml, Selenium only when the static HTML lacks a section")
     args = parser.parse_args()
 
-    if args.backfill:
-        run(mode="backfill", stop_date=args.stop_date)
+    if args.replay:
+        run(mode="replay", url_list=args.url_list, workers=args.workers, flush_every=args.flush_every,
+            migrate_masters=args.migrate_masters)
+    elif args.backfill:
+        run(mode="backfill", stop_date=args.stop_date, migrate_masters=args.migrate_masters)
     elif args.historical:
-        run(mode="historical", url_list=args.url_list, batch_size=args.batch_size)
+        run(mode="historical", url_list=args.url_list, batch_size=args.batch_size,
+            workers=args.workers, backend=args.backend, fetch=args.fetch, flush_every=args.flush_every,
+            force=args.force, check_db=args.check_db, migrate_masters=args.migrate_masters)
     else:
-        run(mode="weekly")
+        run(mode="weekly", workers=args.workers, backend=args.backend, fetch=args.fetch,
+            flush_every=args.flush_every, force=args.force, check_db=args.check_db,
+            migrate_masters=args.migrate_masters)
@@ -9,7 +9,7 @@ Features drawn from:
   - match_team_stats   (match-level team stats)
   - match_player_stats (match-level player stats, aggregated per match)
   - team_stats         (FIFA-style team ratings, most recent before match)
-  - players_stats      (FIFA-style player ratings, averaged per squad via team_roster)
+  - players_stats      (FIFA-style player ratings, latest before match, averaged per squad via team_roster)
 """
 
 import matplotlib
@@ -23,6 +23,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 from mls.database.engine import make_engine
+from mls.features.aggregation import asof_join, SquadIndex
 
 engine = make_engine()
 
@@ -40,6 +41,7 @@ teams              = pd.read_sql("SELECT team_id, team_abbr FROM teams", engine)
 
 matches["date"]              = pd.to_datetime(matches["date"])
 team_stats["date"]           = pd.to_datetime(team_stats["date"])
+players_stats["date"]        = pd.to_datetime(players_stats["date"])
 team_roster["stint_start"]   = pd.to_datetime(team_roster["stint_start"])
 team_roster["stint_end"]     = pd.to_datetime(team_roster["stint_end"])
 
@@ -84,61 +86,35 @@ block_b.columns = ["match_id"] + [f"player_{c}" for c in block_b.columns[1:]]
 # 5. BLOCK C — team_stats: most recent rating before each match
 #    Joined separately for home and away to avoid leakage
 # ─────────────────────────────────────────────────────────────
-print("Joining team ratings (may take a moment)...")
+print("Joining team ratings...")
 rating_cols = ["overall", "attack", "midfield", "defence"]
 
-def latest_rating(team_id, match_date):
-    subset = team_stats[
-        (team_stats["team_id"] == team_id) &
-        (team_stats["date"] < match_date)
-    ]
-    if subset.empty:
-        return {c: np.nan for c in rating_cols}
-    row = subset.sort_values("date").iloc[-1]
-    return {c: row[c] for c in rating_cols}
-
-rating_rows = []
-for _, m in matches.iterrows():
-    h = latest_rating(m["home_team_id"], m["date"])
-    a = latest_rating(m["away_team_id"], m["date"])
-    rating_rows.append({
-        "match_id":       m["match_id"],
-        **{f"team_{c}_home": h[c] for c in rating_cols},
-        **{f"team_{c}_away": a[c] for c in rating_cols},
-    })
-
-block_c = pd.DataFrame(rating_rows)
+def latest_ratings(side):
+    # one merge_asof per side; strict=True keeps team_stats dated before (not on) the match day
+    r = asof_join(matches, team_stats, rating_cols, left_on="date", left_by=f"{side}_team_id",
+                  right_by="team_id", strict=True)
+    return r.rename(columns={c: f"team_{c}_{side}" for c in rating_cols})
+
+block_c = pd.concat([matches[["match_id"]], latest_ratings("home"), latest_ratings("away")], axis=1)
 
 # ─────────────────────────────────────────────────────────────
 # 6. BLOCK D — players_stats averaged per squad via team_roster
 #    For each match, find active squad members and average their
-#    FIFA attribute ratings for home and away teams separately
+#    FIFA attribute ratings for home and away teams separately,
+#    using each player's latest snapshot before the match (no leakage)
 # ─────────────────────────────────────────────────────────────
-print("Averaging squad ratings via team_roster (slowest step)...")
+print("Averaging squad ratings via team_roster...")
 ps_num_cols = [c for c in players_stats.select_dtypes(include=np.number).columns
                if c != "player_id"]
 
-squad_rows = []
-for _, m in matches.iterrows():
-    entry = {"match_id": m["match_id"]}
-    for label, tid in [("home", m["home_team_id"]), ("away", m["away_team_id"])]:
-        squad_ids = team_roster[
-            (team_roster["team_id"] == tid) &
-            (team_roster["stint_start"] <= m["date"]) &
-            ((team_roster["stint_end"].isna()) | (team_roster["stint_end"] >= m["date"]))
-        ]["player_id"]
-
-        squad_stats = players_stats[players_stats["player_id"].isin(squad_ids)]
-        if squad_stats.empty:
-            for c in ps_num_cols:
-                entry[f"squad_{c}_{label}"] = np.nan
-        else:
-            avg = squad_stats[ps_num_cols].mean()
-            for c in ps_num_cols:
-                entry[f"squad_{c}_{label}"] = avg[c]
-    squad_rows.append(entry)
-
-block_d = pd.DataFrame(squad_rows)
+squads = SquadIndex(team_roster)
+
+def squad_ratings(side):
+    avg = squads.point_in_time_mean(players_stats, ps_num_cols, matches[f"{side}_team_id"], matches["date"])
+    avg.index = matches.index
+    return avg.rename(columns={c: f"squad_{c}_{side}" for c in ps_num_cols})
+
+block_d = pd.concat([matches[["match_id"]], squad_ratings("home"), squad_ratings("away")], axis=1)
 
 # ─────────────────────────────────────────────────────────────
 # 7. COMBINE ALL BLOCKS
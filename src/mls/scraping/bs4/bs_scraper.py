@@ -1,19 +1,90 @@
+import asyncio
 import os
+import threading
 import time
 import random
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from urllib3.util.retry import Retry
+
+from mls.utils.scraping.html_cache import default_cache
 
 api_key = os.getenv("SECRET_API_KEY")
 
+SCRAPER_API_URL = "https://scraping.narf.ai/api/v1/"
+
+## size of the keep-alive connection pool to the scraping proxy; it should be at least the fetcher's MAX_CONCURRENT so concurrent requests never have to open a fresh connection.
+HTTP_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "16"))
+
+## transient statuses that urllib3 retries on its own before get_soup's content checks kick in
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+## how long a cached SOFIFA page stays fresh; rosters and ratings only move on weekly updates
+PAGE_TTL = int(os.getenv("SOFIFA_PAGE_TTL", str(24 * 3600)))
+
+
+### function to build a requests session with a pooled, keep-alive HTTPAdapter and urllib3 retries for transient status codes, so repeated page fetches reuse the same TCP/TLS connection.
+def make_session(pool_size=HTTP_POOL_SIZE, retries=3, backoff_factor=0.5):
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+### function to return the shared module-level session, creating it on first use
+def get_session():
+    global _session
+    if _session is None:
+        ## worker threads can all ask for it at once; only the first one builds it
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+### function to replace the shared session, e.g. with a bigger pool before a large concurrent run
+def configure_session(pool_size=HTTP_POOL_SIZE, **kwargs):
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = make_session(pool_size=pool_size, **kwargs)
+        return _session
+
 # This file contains functions to scrape data from the web using BeautifulSoup and the scraping.narf.ai API. It includes functions to get the HTML content of a page, parse tables, and extract player stats from match pages.
 
 # Function to get the HTML content of a page using the scraping.narf.ai API
 
-def get_soup(url, tries=3, timeout=30):
+def get_soup(url, tries=3, timeout=30, session=None, use_cache=True, ttl=PAGE_TTL):
+    ## read through the on-disk page cache first; the key covers the full url including every showCol[] parameter
+    cache = default_cache() if use_cache else None
+    if cache is not None:
+        html = cache.get(url, ttl=ttl)
+        if html is not None:
+            return BeautifulSoup(html, "html.parser")
+
+    session = session or get_session()
     payload = {
         "api_key": api_key,
         "url": url,
@@ -23,8 +94,8 @@ def get_soup(url, tries=3, timeout=30):
 
     for attempt in range(1, tries + 1):
         try:
-            response = requests.get(
-                "https://scraping.narf.ai/api/v1/",
+            response = session.get(
+                SCRAPER_API_URL,
                 params=payload,
                 timeout=timeout
             )
@@ -39,6 +110,10 @@ def get_soup(url, tries=3, timeout=30):
             if soup.find("table") is None:
                 raise RuntimeError("Expected table not found (partial or blocked page)")
 
+            # only pages that passed the checks above are worth keeping
+            if cache is not None:
+                cache.put(url, response.text)
+
             return soup
 
         except Exception as e:
@@ -208,169 +283,159 @@ def add_columns_to_url(u: str, cols) -> str:
     return result
 
 
-### function to scrape team stats from the HTML content of a match page, extracting relevant information such as team names, stats, and linking with match_id and date for context in the dataset. It handles the main team stats table and extracts links to team pages for further scraping of player data.
-def extract_players(team_links):
-    all_players = []
-    failed_links = []
+### function to parse the player table of a single SOFIFA team page into a list of player dicts, tagging each row with the team name, the roster date and the position pulled out of the name cell.
+def parse_team_page(soup, team_url=None):
+    # --- team name ---
+    h1 = soup.select_one("header h1")
+    team = h1.get_text(strip=True) if h1 else None
 
-    def get_soup_with_retry(url, tries=8, base_sleep=2, max_sleep=60):
-        last_err = None
-        for attempt in range(1, tries + 1):
-            try:
-                return get_soup(url)
-            except Exception as e:
-                last_err = e
-                sleep = min(max_sleep, base_sleep * (2 ** (attempt - 1))) + random.random()
-                print(f"[retry {attempt}/{tries}] FAILED {url} | sleeping {sleep:.2f}s")
-                time.sleep(sleep)
-        raise RuntimeError(f"Failed after {tries} tries") from last_err
+    # --- roster date ---
+    date_elem = soup.find('select', {'name': 'roster'})
+    selected_option = None
 
-    for link in team_links:
+    if date_elem:
+        selected_option = (
+            date_elem.find('option', selected=True)
+            or date_elem.find('option')
+        )
 
-        team_url = f"https://sofifa.com{link}"
-        team_url = add_columns_to_url(team_url, COLS)
+    if selected_option:
+        date = selected_option.text.strip()
+        safe_date = date.replace("/", "-").replace(":", "-").strip()
+    else:
+        safe_date = datetime.now().strftime("%Y-%m-%d")
 
-        try:
-            soup = get_soup_with_retry(team_url)
-        except Exception as e:
-            print("FINAL FAIL:", team_url, e)
-            failed_links.append(link)
-            continue
+    # --- player table ---
+    players_table = soup.find("table")
+    if players_table is None:
+        print(f"No table found for team URL: {team_url}")
+        return []
 
-        # --- team name ---
-        h1 = soup.select_one("header h1")
-        team = h1.get_text(strip=True) if h1 else None
+    rows = players_table.find_all("tr")
+    if not rows or not rows[0].find_all("th"):
+        print(f"No header row found for team URL: {team_url}")
+        return []
 
-        # --- roster date ---
-        date_elem = soup.find('select', {'name': 'roster'})
-        selected_option = None
+    headers = [th.get_text(strip=True) for th in rows[0].find_all("th")]
 
-        if date_elem:
-            selected_option = (
-                date_elem.find('option', selected=True)
-                or date_elem.find('option')
-            )
+    players = []
+    for row in rows[1:]:
+        tds = row.find_all("td")
+        if not tds:
+            continue
 
-        if selected_option:
-            date = selected_option.text.strip()
-            safe_date = date.replace("/", "-").replace(":", "-").strip()
-        else:
-            safe_date = datetime.now().strftime("%Y-%m-%d")
+        cols = []
+        extracted_position = None
 
-        # --- player table ---
-        players_table = soup.find("table")
-        if players_table is None:
-            print(f"No table found for team URL: {team_url}")
-            continue
+        for i, td in enumerate(tds):
+            header = headers[i] if i < len(headers) else f"col_{i}"
 
-        rows = players_table.find_all("tr")
-        if not rows or not rows[0].find_all("th"):
-            print(f"No header row found for team URL: {team_url}")
-            continue
+            if header.lower() == "name":
+                name_a = td.select_one('a[href^="/player/"]')
+                pos_span = td.select_one("span.pos")
 
-        headers = [th.get_text(strip=True) for th in rows[0].find_all("th")]
+                name = name_a.get_text(strip=True) if name_a else td.get_text(" ", strip=True)
+                pos = pos_span.get_text(strip=True) if pos_span else None
 
-        for row in rows[1:]:
-            tds = row.find_all("td")
-            if not tds:
-                continue
+                cols.append(name)
+                extracted_position = pos
+            else:
+                cols.append(td.get_text(strip=True))
 
-            cols = []
-            extracted_position = None
+        player_data = dict(zip(headers, cols))
+        player_data["position"] = extracted_position
+        player_data["date"] = safe_date
+        player_data["team"] = team
 
-            for i, td in enumerate(tds):
-                header = headers[i] if i < len(headers) else f"col_{i}"
+        players.append(player_data)
 
-                if header.lower() == "name":
-                    name_a = td.select_one('a[href^="/player/"]')
-                    pos_span = td.select_one("span.pos")
+    return players
 
-                    name = name_a.get_text(strip=True) if name_a else td.get_text(" ", strip=True)
-                    pos = pos_span.get_text(strip=True) if pos_span else None
 
-                    cols.append(name)
-                    extracted_position = pos
-                else:
-                    cols.append(td.get_text(strip=True))
+#----CONCURRENT TEAM-PAGE FETCHING----#
 
-            player_data = dict(zip(headers, cols))
-            player_data["position"] = extracted_position
-            player_data["date"] = safe_date
-            player_data["team"] = team
+## concurrency settings for the team-page fetcher: at most MAX_CONCURRENT requests in flight, and each host refills RATE_PER_SEC tokens per second up to RATE_BURST so the proxy never sees more than a short burst.
+MAX_CONCURRENT = 8
+RATE_PER_SEC = 2.0
+RATE_BURST = 4
 
-            all_players.append(player_data)
 
-    # --- second pass retry after cooldown ---
-    if failed_links:
-        print(f"\nCooling down before second pass ({len(failed_links)} failed)...")
-        time.sleep(90)
+### token bucket shared by every task hitting the same host; acquire() waits until a token is available instead of sleeping a fixed amount.
+class TokenBucket:
+    def __init__(self, rate=RATE_PER_SEC, burst=RATE_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
 
-        for link in failed_links:
-            team_url = f"https://sofifa.com{link}"
-            team_url = add_columns_to_url(team_url, COLS)
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
+
+### fetch one page with jittered exponential backoff; the semaphore only covers the request itself, so a task that is backing off does not hold a slot.
+async def fetch_soup(url, sem, bucket, tries=8, base_sleep=2, max_sleep=60, label="retry"):
+    last_err = None
+    for attempt in range(1, tries + 1):
+        async with sem:
+            await bucket.acquire()
             try:
-                soup = get_soup_with_retry(team_url, tries=6)
+                # get_soup is blocking, so each request runs in a worker thread
+                return await asyncio.to_thread(get_soup, url, 1)
             except Exception as e:
-                print("FAILED AGAIN:", team_url, e)
-                continue
-
-            h1 = soup.select_one("header h1")
-            team = h1.get_text(strip=True) if h1 else None
-
-            date_elem = soup.find('select', {'name': 'roster'})
-            selected_option = None
+                last_err = e
 
-            if date_elem:
-                selected_option = (
-                    date_elem.find('option', selected=True)
-                    or date_elem.find('option')
-                )
+        if attempt == tries:
+            break
 
-            if selected_option:
-                date = selected_option.text.strip()
-                safe_date = date.replace("/", "-").replace(":", "-").strip()
-            else:
-                safe_date = datetime.now().strftime("%Y-%m-%d")
+        # full jitter keeps retries from many links from lining up on the same second
+        sleep = random.uniform(0, min(max_sleep, base_sleep * (2 ** (attempt - 1))))
+        print(f"[{label} {attempt}/{tries}] FAILED {url} | sleeping {sleep:.2f}s")
+        await asyncio.sleep(sleep)
 
-            players_table = soup.find("table")
-            if players_table is None:
-                continue
+    raise RuntimeError(f"Failed after {tries} tries") from last_err
 
-            rows = players_table.find_all("tr")
-            if not rows or not rows[0].find_all("th"):
-                continue
 
-            headers = [th.get_text(strip=True) for th in rows[0].find_all("th")]
+### fetch and parse one team page; a link that exhausts its first round of retries goes straight into a second, shorter round instead of waiting for the rest of the teams.
+async def fetch_team_players(link, sem, buckets):
+    team_url = f"https://sofifa.com{link}"
+    team_url = add_columns_to_url(team_url, COLS)
 
-            for row in rows[1:]:
-                tds = row.find_all("td")
-                if not tds:
-                    continue
+    host = urlparse(team_url).netloc
+    bucket = buckets.setdefault(host, TokenBucket())
 
-                cols = []
-                extracted_position = None
+    try:
+        soup = await fetch_soup(team_url, sem, bucket)
+    except Exception as e:
+        print("FIRST PASS FAIL:", team_url, e)
+        try:
+            soup = await fetch_soup(team_url, sem, bucket, tries=6, label="second pass")
+        except Exception as e:
+            print("FAILED AGAIN:", team_url, e)
+            return []
 
-                for i, td in enumerate(tds):
-                    header = headers[i] if i < len(headers) else f"col_{i}"
+    return parse_team_page(soup, team_url)
 
-                    if header.lower() == "name":
-                        name_a = td.select_one('a[href^="/player/"]')
-                        pos_span = td.select_one("span.pos")
 
-                        name = name_a.get_text(strip=True) if name_a else td.get_text(" ", strip=True)
-                        pos = pos_span.get_text(strip=True) if pos_span else None
+async def extract_players_async(team_links, max_concurrent=MAX_CONCURRENT):
+    sem = asyncio.Semaphore(max_concurrent)
+    buckets = {}
 
-                        cols.append(name)
-                        extracted_position = pos
-                    else:
-                        cols.append(td.get_text(strip=True))
+    results = await asyncio.gather(*(fetch_team_players(link, sem, buckets) for link in team_links))
 
-                player_data = dict(zip(headers, cols))
-                player_data["position"] = extracted_position
-                player_data["date"] = safe_date
-                player_data["team"] = team
+    # gather keeps the order of team_links, so the output matches the sequential version
+    all_players = [player for players in results for player in players]
+    return pd.DataFrame(all_players)
 
-                all_players.append(player_data)
 
-    return pd.DataFrame(all_players)
\ No newline at end of file
+### function to scrape player stats from every SOFIFA team page in team_links, fetching the pages concurrently and returning one dataframe with a row per player.
+def extract_players(team_links, max_concurrent=MAX_CONCURRENT):
+    return asyncio.run(extract_players_async(team_links, max_concurrent=max_concurrent))
@@ -2,7 +2,11 @@ import mls.scraping.bs4.bs_scraper as bscraper
 
 
 
-def scrape_sofifa():
+def scrape_sofifa(pool_size=None):
+    ## optionally resize the shared keep-alive pool before the 30+ team fetches
+    if pool_size is not None:
+        bscraper.configure_session(pool_size=pool_size)
+
     ## base sofifa url for teams with query parameters to specify which columns we want to scrape for team stats, this allows us to get more detailed stats without having to scrape the entire page and then filter, which can be more efficient and reduce the amount of data we need to process while still getting all the relevant stats for our analysis.
     sofifa_url = 'https://sofifa.com/teams?type=all&lg%5B0%5D=39&showCol%5B%5D=ti&showCol%5B%5D=fm&showCol%5B%5D=oa&showCol%5B%5D=at&showCol%5B%5D=md&showCol%5B%5D=df&showCol%5B%5D=dm&showCol%5B%5D=ps&showCol%5B%5D=cw'
     
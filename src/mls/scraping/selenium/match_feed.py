@@ -4,35 +4,44 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from mls.utils.scraping import selenium_helpers
+from mls.utils.scraping.html_cache import default_cache
 from bs4 import BeautifulSoup
 
 
-def extract_feed(driver, match_id, date):
-    wait = WebDriverWait(driver, 10)
-    rows = []
+def load_feed_html(driver, wait):
+    # Make sure header exists (page loaded)
+    title_head = wait.until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "section.mls-l-module--match-hub-header-container"))
+    )
+    selenium_helpers.js_scroll_into_view(driver, title_head)
 
-    try:
-        # Make sure header exists (page loaded)
-        title_head = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "section.mls-l-module--match-hub-header-container"))
-        )
-        selenium_helpers.js_scroll_into_view(driver, title_head)
+    # Click Feed tab (safe click)
+    feed_button = wait.until(
+        EC.element_to_be_clickable((By.XPATH, "//button[normalize-space(.)='Feed'] | //a[normalize-space(.)='Feed']"))
+    )
+    driver.execute_script("arguments[0].click();", feed_button)
 
-        # Click Feed tab (safe click)
-        feed_button = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[normalize-space(.)='Feed'] | //a[normalize-space(.)='Feed']"))
-        )
-        driver.execute_script("arguments[0].click();", feed_button)
+    # Wait until feed container exists before scrolling/loading
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed")))
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed__container")))
 
-        # Wait until feed container exists before scrolling/loading
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed")))
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.mls-o-match-feed__container")))
+    # Now load everything (lazy load)
+    selenium_helpers.load_full_feed_by_height(driver, step_px=1500, delay=0.6, max_rounds=80, stable_rounds_required=3)
 
-        # Now load everything (lazy load)
-        selenium_helpers.load_full_feed_by_height(driver, step_px=1500, delay=0.6, max_rounds=80, stable_rounds_required=3)
+    # Re-grab HTML after loading is complete
+    return driver.page_source
 
-        # Re-grab HTML after loading is complete
-        html = driver.page_source
+
+def extract_feed(driver, match_id, date):
+    wait = WebDriverWait(driver, 10)
+    rows = []
+    cache = default_cache()
+    url = driver.current_url
+
+    try:
+        # reuse a fully loaded capture of this feed if one is cached
+        cached = cache.get(url, variant="feed")
+        html = cached if cached is not None else load_feed_html(driver, wait)
 
         # Parse with BeautifulSoup
         soup = BeautifulSoup(html, "lxml")
@@ -62,6 +71,9 @@ def extract_feed(driver, match_id, date):
                 "in_player": in_player,
             })
 
+        if cached is None and rows:
+            cache.put(url, html, variant="feed")
+
     except Exception as e:
         print(f"[ERR] extract_feed failed for match {match_id}: {type(e).__name__}: {e}")
         traceback.print_exc()
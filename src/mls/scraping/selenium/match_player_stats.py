@@ -5,9 +5,17 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from mls.utils.scraping import selenium_helpers
 from mls.scraping.bs4 import bs_scraper as bs
+from mls.utils.scraping.html_cache import default_cache
 
 
 def extract_players(driver, match_id, date):
+    ### reuse an earlier capture of this match's player tables if one is cached
+    cached = default_cache().get(driver.current_url, variant="players")
+    if cached is not None:
+        result = bs.parse_player_stats_from_html(cached, match_id)
+        if isinstance(result, tuple) and not result[0].empty:
+            return result
+
     wait = WebDriverWait(driver, 10)
     
     ### scroll to top of page to ensure buttons are visible
@@ -65,6 +73,8 @@ def extract_players(driver, match_id, date):
     if result is None:
         return None, None
     df_outfield, df_gk = result
+    if not df_outfield.empty:
+        default_cache().put(driver.current_url, html, variant="players")
     
     return df_outfield, df_gk
     
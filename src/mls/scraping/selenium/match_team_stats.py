@@ -58,6 +58,7 @@ def extract_team_stats(driver, match_id):
             stats_bttn.click()
             
             ### wait for stats content to load before attempting to scrape data            
+            selenium_helpers.wait_for_stats_module(driver)
             general_cont = wait.until(
                 EC.presence_of_element_located((
                     By.XPATH,
@@ -14,11 +14,13 @@ from mls.scraping.selenium.match_team_stats import extract_team_stats
 from mls.scraping.selenium.match_player_stats import extract_players
 from mls.scraping.selenium.match_feed import extract_feed
 from mls.utils.scraping import hashing
+from mls.utils.scraping.io import FrameSink
 
 
 def scrape_matches():
     
     driver = selenium_helpers.set_up_driver()
+    selenium_helpers.consent_for(driver).seed()
     wait = WebDriverWait(driver, 10)
     
     ## navigate to most recent schedule page (weekly))
@@ -26,8 +28,8 @@ def scrape_matches():
     
     driver.implicitly_wait(2)
     
-    ## dismiss cookies if prompted
-    selenium_helpers.dismiss_cookies(driver)
+    ## dismiss cookies if prompted (once per session)
+    selenium_helpers.ensure_consent(driver)
 
     wait = WebDriverWait(driver, 3)
     
@@ -42,12 +44,8 @@ def scrape_matches():
         return pd.DataFrame()
     
     
-    ### initialize empty dataframes to hold combined data across matches
-    combined_team_stats = pd.DataFrame()
-    combined_outfield_stats = pd.DataFrame()
-    combined_gk_stats = pd.DataFrame()
-    combined_feed = pd.DataFrame()
-    combined_match_data = pd.DataFrame()
+    ### buffer per-match frames and concatenate once, instead of re-copying the combined frames every match
+    sink = FrameSink(["team_stats", "outfield", "gk", "feed", "match_data"])
     
     ### loop through match links and extract data for each match
     count = 1
@@ -70,11 +68,12 @@ def scrape_matches():
 
             try:
                 driver.get(link)
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                selenium_helpers.wait_for_match_header(driver)
+                selenium_helpers.ensure_consent(driver)
 
                 # --- team stats + match meta ---
                 match_team_data, date, home_team, away_team, home_team_score, away_team_score = extract_team_stats(driver, match_id)
-                combined_team_stats = pd.concat([combined_team_stats, match_team_data], ignore_index=True)
+                frames = {"team_stats": match_team_data}
 
                 match_data = pd.DataFrame([{
                     "match_id": match_id,
@@ -84,19 +83,21 @@ def scrape_matches():
                     "home_team_score": home_team_score,
                     "away_team_score": away_team_score
                 }])
-                combined_match_data = pd.concat([combined_match_data, match_data], ignore_index=True)
+                frames["match_data"] = match_data
 
                 # --- player stats ---
                 df_outfield, df_gk = extract_players(driver, match_id, date)
                 if df_outfield is not None and df_gk is not None:
-                    combined_outfield_stats = pd.concat([combined_outfield_stats, df_outfield], ignore_index=True)
-                    combined_gk_stats = pd.concat([combined_gk_stats, df_gk], ignore_index=True)
+                    frames["outfield"] = df_outfield
+                    frames["gk"] = df_gk
 
                 # --- feed ---
                 match_feed_data = extract_feed(driver, match_id, date)
                 match_feed_data["home_team"] = home_team
                 match_feed_data["away_team"] = away_team
-                combined_feed = pd.concat([combined_feed, match_feed_data], ignore_index=True)
+                frames["feed"] = match_feed_data
+
+                sink.add(frames)
 
             except Exception as e:
                 print(f"[FAILED] match_id={match_id} | url={link} | {e}")
@@ -122,4 +123,5 @@ def scrape_matches():
     # optional: save failed list somewhere
     # pd.DataFrame(failed).to_csv("data/raw/match_scrape_failures.csv", index=False)
 
-    return combined_team_stats, combined_outfield_stats, combined_gk_stats, combined_feed, combined_match_data
\ No newline at end of file
+    combined = sink.result()
+    return combined["team_stats"], combined["outfield"], combined["gk"], combined["feed"], combined["match_data"]
\ No newline at end of file
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+## a season touches a few thousand player names and ~30 club spellings; this comfortably holds several seasons
+NAME_CACHE_SIZE = 65536
+
+_punct = re.compile(r"[^\w\s]")
+_spaces = re.compile(r"\s+")
+
+
+def strip_accents(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s)
+    return "".join(c for c in s if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _name_key(s: str) -> str:
+    s = s.replace("\u200b", "").replace("\xa0", " ").strip()
+    s = strip_accents(s).lower()
+    s = s.replace(".", " ")
+    s = _punct.sub(" ", s)
+    return _spaces.sub(" ", s).strip()
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _compact_key(s: str) -> Optional[str]:
+    s = strip_accents(s)
+    s = s.lower().strip()
+    s = _punct.sub("", s)
+    s = _spaces.sub(" ", s)
+    return s or None
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _team_key(s: str) -> str:
+    return s.lower().strip().replace(".", "").replace("\u2019", "'")
+
+
+def norm_name(s) -> str:
+    """Matching key for player names ("A. Markanich" -> "a markanich"); "" for missing."""
+    if pd.isna(s):
+        return ""
+    return _name_key(str(s))
+
+
+def norm_name_compact(s) -> Optional[str]:
+    """SoFIFA-style key: punctuation removed rather than spaced ("O'Brien" -> "obrien"); None for missing/empty."""
+    if pd.isna(s):
+        return None
+    return _compact_key(str(s))
+
+
+def norm_team(s) -> str:
+    """Lookup key for club names against team_map ("D.C. United" -> "dc united")."""
+    if pd.isna(s):
+        return ""
+    return _team_key(str(s))
+
+
+def norm_abbr(s) -> str:
+    if pd.isna(s):
+        return ""
+    return str(s).strip().upper()
+
+
+def normalize_series(s: pd.Series, fn: Callable = norm_name) -> pd.Series:
+    """
+    Apply a scalar normalizer to a Series, calling it once per distinct value.
+
+    Match frames repeat the same names on every row a player appears in, so
+    this costs one call per unique name (and the lru_cache behind the norm_*
+    functions carries those results across batches).
+    """
+    codes, uniq = pd.factorize(s, use_na_sentinel=False)
+    out = np.array([fn(u) for u in uniq], dtype=object)
+    return pd.Series(out[codes], index=s.index, name=s.name, dtype=object)
+
+
+def clear_caches() -> None:
+    for f in (_name_key, _compact_key, _team_key):
+        f.cache_clear()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from mls.utils.scraping.paths import repo_root
+
+## default location and budget for cached pages; both can be overridden from the environment
+CACHE_DIR = Path(os.getenv("MLS_HTML_CACHE_DIR", repo_root() / "data" / "cache" / "html"))
+CACHE_MAX_BYTES = int(os.getenv("MLS_HTML_CACHE_MB", "2048")) * 1024 * 1024
+
+## when the budget is exceeded, evict least recently used pages down to this fraction of it
+EVICT_TO = 0.9
+
+
+def canonical_url(url: str) -> str:
+    # drop the fragment and sort the query so the same page + showCol[] set always hashes the same
+    pu = urlparse(url)
+    pairs = sorted(parse_qsl(pu.query, keep_blank_values=True))
+    return urlunparse(pu._replace(query=urlencode(pairs, doseq=True), fragment=""))
+
+
+def cache_key(url: str, variant: str = "") -> str:
+    # same md5 scheme as make_match_id, but the full digest since this keys every page we fetch
+    base = canonical_url(url) + (f"#{variant}" if variant else "")
+    return hashlib.md5(base.encode("utf-8")).hexdigest()
+
+
+class HtmlCache:
+    """
+    Content-addressed, gzip-compressed page cache on disk.
+
+    Pages live at <root>/<key[:2]>/<key>.html.gz; a small SQLite index next to
+    them records the url, fetch time, last access and size of every entry so
+    TTL checks and LRU eviction never have to stat the whole tree.
+
+    `variant` separates different captures of the same URL (e.g. the Selenium
+    page_source after clicking the Players tab vs the Feed tab).
+    """
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 ttl: Optional[float] = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key         TEXT PRIMARY KEY,
+                url         TEXT NOT NULL,
+                variant     TEXT NOT NULL,
+                fetched_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size        INTEGER NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.html.gz"
+
+    def get(self, url: str, variant: str = "", ttl: Optional[float] = None) -> Optional[str]:
+        """Cached HTML for url, or None if missing or older than ttl seconds (None = never expires)."""
+        key = cache_key(url, variant)
+        ttl = self.ttl if ttl is None else ttl
+
+        with self._lock:
+            row = self._db.execute("SELECT fetched_at FROM pages WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if ttl is not None and time.time() - row[0] > ttl:
+            return None
+
+        try:
+            html = gzip.decompress(self.path_for(key).read_bytes()).decode("utf-8")
+        except (OSError, EOFError):
+            # file vanished or was truncated; forget it so the next fetch rewrites it
+            with self._lock:
+                self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            return None
+
+        with self._lock:
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return html
+
+    def put(self, url: str, html: str, variant: str = "", fetched_at: Optional[float] = None) -> str:
+        key = cache_key(url, variant)
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = gzip.compress(html.encode("utf-8"), compresslevel=6)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (key, url, variant, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, canonical_url(url), variant, fetched_at or now, now, len(data)),
+            )
+        self.evict()
+        return key
+
+    def fetch(self, url: str, fetcher, variant: str = "", ttl: Optional[float] = None) -> str:
+        """Read-through: return the cached page or call fetcher(url), store and return its HTML."""
+        html = self.get(url, variant=variant, ttl=ttl)
+        if html is None:
+            html = fetcher(url)
+            self.put(url, html, variant=variant)
+        return html
+
+    def entries(self, variant: Optional[str] = None) -> list:
+        """(url, variant, fetched_at) for every cached page, optionally for one variant only."""
+        sql = "SELECT url, variant, fetched_at FROM pages"
+        args = ()
+        if variant is not None:
+            sql += " WHERE variant = ?"
+            args = (variant,)
+        with self._lock:
+            return self._db.execute(sql + " ORDER BY fetched_at", args).fetchall()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def evict(self) -> int:
+        """Drop least recently used pages until the cache is back under its byte budget."""
+        if self.total_bytes() <= self.max_bytes:
+            return 0
+
+        target = int(self.max_bytes * EVICT_TO)
+        removed = 0
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            for key, size in self._db.execute(
+                "SELECT key, size FROM pages ORDER BY accessed_at"
+            ).fetchall():
+                if total <= target:
+                    break
+                self.path_for(key).unlink(missing_ok=True)
+                self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        return removed
+
+
+_default_cache: Optional[HtmlCache] = None
+
+
+def default_cache() -> HtmlCache:
+    # one instance per process: SQLite connections must not be shared across a fork
+    global _default_cache
+    if _default_cache is None or _default_cache.pid != os.getpid():
+        _default_cache = HtmlCache()
+    return _default_cache
@@ -1,10 +1,115 @@
 from __future__ import annotations
+import threading
 from pathlib import Path
 import pandas as pd
 
+## matches buffered before a FrameSink hands its chunk off
+FLUSH_EVERY = 10
+
 def write_csv(df: pd.DataFrame, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(path, index=False)
 
 def read_csv(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path)
\ No newline at end of file
+    return pd.read_csv(path)
+
+
+class FlushError(RuntimeError):
+    """on_flush raised; the chunk's rows are back in the sink and go out with the next flush."""
+
+
+class FrameSink:
+    """
+    Row buffer for per-match frames.
+
+    Frames are kept as lists and concatenated once per flush instead of once
+    per match. Every `flush_every` matches the buffered chunk is handed to
+    `on_flush`, so completed matches are persisted as the run goes. Without
+    `on_flush` the chunks are kept and returned by result(). Tags passed to
+    add() (e.g. the match URL) are given to `on_done` after their chunk is flushed.
+
+    If `on_flush` fails, the chunk is put back in front of the buffer and a
+    FlushError is raised; the next flush (after another `flush_every` matches,
+    or flush()/result()) retries it together with the newer rows.
+    """
+
+    def __init__(self, keys, on_flush=None, flush_every: int = FLUSH_EVERY, on_done=None):
+        self.keys = list(keys)
+        self.on_flush = on_flush
+        self.on_done = on_done
+        self.flush_every = max(1, flush_every)
+        self._buffers = {k: [] for k in self.keys}
+        self._tags = []
+        self._pending = 0
+        self._held = 0      # matches from a failed flush, waiting to be retried
+        self._kept = []
+        self._lock = threading.Lock()
+        self._emit_lock = threading.Lock()
+
+    def add(self, frames: dict, tag=None):
+        chunk = None
+        with self._lock:
+            for key, df in frames.items():
+                if df is not None and not df.empty:
+                    self._buffers[key].append(df)
+            if tag is not None:
+                self._tags.append(tag)
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                chunk = self._take()
+        if chunk is not None:
+            self._emit(*chunk)
+
+    def flush(self):
+        with self._lock:
+            chunk = self._take() if self._pending or self._held else None
+        if chunk is not None:
+            self._emit(*chunk)
+
+    def result(self) -> dict:
+        self.flush()
+        return self.kept()
+
+    def kept(self) -> dict:
+        """Chunks kept so far (only without on_flush), one frame per key; does not flush."""
+        return {k: pd.concat([c[k] for c in self._kept], ignore_index=True) if self._kept else pd.DataFrame()
+                for k in self.keys}
+
+    def drain(self) -> tuple:
+        """Take every buffered row and tag, including a chunk whose flush failed, without flushing them."""
+        with self._lock:
+            chunk, tags, _ = self._take()
+        return chunk, tags
+
+    def _take(self) -> tuple:
+        chunk = {k: pd.concat(v, ignore_index=True) if v else pd.DataFrame()
+                 for k, v in self._buffers.items()}
+        tags, matches = self._tags, self._pending + self._held
+        self._buffers = {k: [] for k in self.keys}
+        self._tags = []
+        self._pending = self._held = 0
+        return chunk, tags, matches
+
+    def _requeue(self, chunk: dict, tags: list, matches: int):
+        # ahead of anything added meanwhile, so rows keep their scrape order
+        with self._lock:
+            for key, df in chunk.items():
+                if not df.empty:
+                    self._buffers[key].insert(0, df)
+            self._tags = tags + self._tags
+            self._held += matches
+
+    def _emit(self, chunk: dict, tags: list, matches: int):
+        # one flush at a time, outside the buffer lock so scraping threads keep adding
+        with self._emit_lock:
+            if self.on_flush is None:
+                self._kept.append(chunk)
+            else:
+                try:
+                    self.on_flush(chunk)
+                except Exception as e:
+                    self._requeue(chunk, tags, matches)
+                    raise FlushError(f"flush of {matches} matches failed ({e}); kept for the next flush") from e
+            # tags are only reported once their rows are safely handed off
+            if self.on_done is not None and tags:
+                self.on_done(tags)
@@ -7,7 +7,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from typing import List, Dict, Optional
+from datetime import datetime, timezone
 import time
+import weakref
 import re
 import pandas as pd
 
@@ -161,6 +163,147 @@ def dismiss_cookies(driver, timeout=8):
 
 
 
+### READINESS WAITS (poll concrete DOM signals instead of sleeping) ###
+
+READY_TIMEOUT = 8
+READY_POLL = 0.1
+
+MATCH_HEADER_CSS = "section[data-bucket-name='match-header']"
+COOKIE_BANNER_ID = "onetrust-banner-sdk"
+STATS_CARD_XPATH = ('//section[contains(@class,"mls-l-module--stats-comparison")'
+                    ' and not(contains(@style,"display: none"))]'
+                    '//*[contains(@class,"mls-o-stat-chart__first-value")]')
+SCHEDULE_CLASS = "mls-c-schedule__matches"
+
+
+# Function to wait on a condition with a short timeout, returning False instead of raising
+def wait_for(driver, condition, timeout=READY_TIMEOUT) -> bool:
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=READY_POLL).until(condition)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_match_header(driver, timeout=READY_TIMEOUT) -> bool:
+    return wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, MATCH_HEADER_CSS)), timeout)
+
+
+# also true when the banner was never mounted
+def wait_for_cookie_banner_gone(driver, timeout=3) -> bool:
+    return wait_for(driver, EC.invisibility_of_element_located((By.ID, COOKIE_BANNER_ID)), timeout)
+
+
+# stats cards are mounted empty and filled by React; wait for an actual value
+def wait_for_stats_module(driver, timeout=READY_TIMEOUT) -> bool:
+    def _rendered(d):
+        return any((el.get_attribute("textContent") or "").strip()
+                   for el in d.find_elements(By.XPATH, STATS_CARD_XPATH))
+    return wait_for(driver, _rendered, timeout)
+
+
+def schedule_hrefs(driver) -> set:
+    try:
+        table = driver.find_element(By.CLASS_NAME, SCHEDULE_CLASS)
+        return {a.get_attribute("href") for a in table.find_elements(By.TAG_NAME, "a")}
+    except (NoSuchElementException, WebDriverException):
+        return set()
+
+
+def wait_for_schedule(driver, timeout=READY_TIMEOUT) -> bool:
+    return wait_for(driver, lambda d: bool(schedule_hrefs(d)), timeout)
+
+
+# after "Previous results" the list re-renders; wait until it holds a different set of links
+def wait_for_schedule_update(driver, previous: set, timeout=READY_TIMEOUT) -> bool:
+    def _changed(d):
+        hrefs = schedule_hrefs(d)
+        return bool(hrefs) and hrefs != previous
+    return wait_for(driver, _changed, timeout)
+
+
+### SESSION-LEVEL COOKIE CONSENT ###
+
+CONSENT_DOMAIN = ".mlssoccer.com"
+CONSENT_GROUPS = "C0001:1,C0002:1,C0003:1,C0004:1"
+
+BANNER_VISIBLE_JS = """
+    var el = document.getElementById(arguments[0]);
+    if (!el) return false;
+    var style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+"""
+
+
+# OneTrust reads these two cookies to decide whether to mount the banner at all
+def consent_cookies() -> list:
+    stamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    consent = (
+        f"isGpcEnabled=0&datestamp={stamp}&version=202401.1.0&isIABGlobal=false"
+        f"&hosts=&landingPath=NotLandingPage&groups={CONSENT_GROUPS.replace(':', '%3A').replace(',', '%2C')}"
+        "&AwaitingReconsent=false"
+    )
+    return [
+        {"name": "OptanonAlertBoxClosed", "value": stamp},
+        {"name": "OptanonConsent", "value": consent},
+    ]
+
+
+# Pre-seeds consent and remembers success so later pages only check the banner instead of running dismiss_cookies
+class ConsentManager:
+    def __init__(self, driver):
+        self.driver = driver
+        self.seeded = False
+        self.accepted = False
+
+    def seed(self):
+        # CDP works before the first navigation; add_cookie needs to already be on the domain
+        for c in consent_cookies():
+            cookie = {**c, "domain": CONSENT_DOMAIN, "path": "/"}
+            try:
+                self.driver.execute_cdp_cmd("Network.setCookie", cookie)
+            except WebDriverException:
+                try:
+                    self.driver.add_cookie(cookie)
+                except WebDriverException:
+                    pass
+        self.seeded = True
+
+    def banner_visible(self) -> bool:
+        # looked up in page JS: find_elements would sit out the driver's implicit wait
+        # on every call in the usual case, where the banner is not mounted at all
+        try:
+            return bool(self.driver.execute_script(BANNER_VISIBLE_JS, COOKIE_BANNER_ID))
+        except WebDriverException:
+            return False
+
+    def ensure(self) -> bool:
+        if not self.seeded:
+            self.seed()
+        if self.accepted and not self.banner_visible():
+            return True
+        dismiss_cookies(self.driver)
+        # the banner animates out after the click; polling the JS check also returns at once when it never mounted
+        self.accepted = wait_for(self.driver, lambda d: not self.banner_visible(), timeout=2)
+        if self.accepted:
+            print("[cookies] consent recorded for this session")
+        return self.accepted
+
+
+_consent_managers = weakref.WeakKeyDictionary()
+
+
+def consent_for(driver) -> ConsentManager:
+    manager = _consent_managers.get(driver)
+    if manager is None:
+        manager = _consent_managers[driver] = ConsentManager(driver)
+    return manager
+
+
+def ensure_consent(driver) -> bool:
+    return consent_for(driver).ensure()
+
+
 ### FUNCTIONS FOR SELENIUM SCRAPING OF MATCH DATA ###
 
 # Function to load the match feed by scrolling until no new content loads
@@ -170,7 +313,7 @@ def extract_match_links(driver):
     ### Load the page
     driver.get('https://www.mlssoccer.com/schedule/scores#competition=MLS-COM-000001&club=all')
     
-    wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "body")))
+    wait_for_schedule(driver)
 
     ### find last week's matches
     all_links = set()
@@ -181,10 +324,11 @@ def extract_match_links(driver):
         previous_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Previous results']"))) 
         
         # Click the button to get to last week's matches as scrape runs on Monday morning for the previous week's matches
+        current = schedule_hrefs(driver)
         previous_button.click() 
         
-        # Wait for the page to load after clicking
-        time.sleep(3)  
+        # Wait for the schedule to re-render with the previous week's links
+        wait_for_schedule_update(driver, current)
         
         matches_table = wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'mls-c-schedule__matches')))
         if not matches_table: